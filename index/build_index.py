@@ -21,13 +21,68 @@ try:
 except ImportError:
     SentenceTransformer = None
 
+try:
+    import torch
+except ImportError:
+    torch = None
+
 from ingest.chunker import ChunkingConfig, TextChunker
 from ingest.loader import DocumentLoader
+from retriever.id_map_store import ColumnarIdMap
 from retriever.models import IndexStats, TextChunk
 
 logger = logging.getLogger(__name__)
 
 
+def build_faiss_index(embeddings: np.ndarray, index_config: Dict[str, Any]):
+    """
+    Create, train and fill the FAISS index described by the index config.
+
+    Args:
+        embeddings: (num_vectors, dimension) float32 embeddings; normalized
+            to unit length in place
+        index_config: The config.yaml "index" section
+
+    Returns:
+        FAISS index holding the embeddings
+    """
+    dimension = embeddings.shape[1]
+
+    # Inner product over normalized vectors gives cosine similarity. The
+    # default "SQfp16" factory scans every vector stored at half
+    # precision; queries stay fp32. "Flat" keeps exact fp32 vectors and
+    # large corpora can opt into a sublinear index such as
+    # "IVF4096_HNSW32,PQ64".
+    factory = index_config.get("factory", "SQfp16")
+    index = faiss.index_factory(dimension, factory, faiss.METRIC_INNER_PRODUCT)
+
+    # Normalize embeddings for cosine similarity
+    faiss.normalize_L2(embeddings)
+
+    # HNSW graph quality is fixed at build time: a larger efConstruction
+    # gives better recall for a slower build
+    if hasattr(index, "hnsw"):
+        index.hnsw.efConstruction = index_config.get("ef_construction", 64)
+
+    # int8 scalar quantizers ("SQ8", "IVF...,SQ8") store a quarter of the
+    # fp32 bytes; train their range on the 1%-99% quantiles so a few
+    # outlier components don't stretch the 256 levels
+    sq = getattr(index, "sq", None)
+    if sq is not None and sq.qtype == faiss.ScalarQuantizer.QT_8bit:
+        sq.rangestat = faiss.ScalarQuantizer.RS_quantiles
+        sq.rangestat_arg = 0.01
+
+    # IVF/PQ/SQ8 indexes must be trained before vectors can be added
+    if not index.is_trained:
+        logger.info(f"Training {factory} index on {len(embeddings)} vectors")
+        index.train(embeddings)
+
+    # Add embeddings to index
+    index.add(embeddings)
+
+    return index
+
+
 class VectorIndexBuilder:
     """Builds and manages FAISS vector index for legal documents."""
 
@@ -48,6 +103,8 @@ class VectorIndexBuilder:
         self.model = None
         self.index = None
         self.chunks_metadata = []
+        # Copy of the stored vectors on the embedding device (see to_device)
+        self.device_vectors = None
 
         # Ensure required dependencies
         if faiss is None:
@@ -223,16 +280,7 @@ class VectorIndexBuilder:
         """Build FAISS index from embeddings."""
         logger.info("Building FAISS index...")
 
-        dimension = embeddings.shape[1]
-
-        # Use IndexFlatIP for cosine similarity (inner product after normalization)
-        self.index = faiss.IndexFlatIP(dimension)
-
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(embeddings)
-
-        # Add embeddings to index
-        self.index.add(embeddings)
+        self.index = build_faiss_index(embeddings, self.index_config)
 
         logger.info(f"Built FAISS index with {self.index.ntotal} vectors")
 
@@ -250,6 +298,7 @@ class VectorIndexBuilder:
 
         # Save metadata as JSONL for easier access
         id_map_path = faiss_dir / "id_map.jsonl"
+        id_map_records = []
         with open(id_map_path, "w", encoding="utf-8") as f:
             for i, chunk in enumerate(self.chunks_metadata):
                 meta = {
@@ -269,6 +318,10 @@ class VectorIndexBuilder:
                     },
                 }
                 f.write(json.dumps(meta) + "\n")
+                id_map_records.append(meta)
+
+        # Columnar copy of the id_map for memory-mapped loading by the retriever
+        ColumnarIdMap.from_records(id_map_records).save(faiss_dir / "id_map_soa")
 
         # Also save legacy pickle format for backward compatibility
         metadata_path = index_path / "chunks_metadata.pkl"
@@ -294,36 +347,251 @@ class VectorIndexBuilder:
         return total_size / (1024 * 1024)
 
     def search(
-        self, query_embedding: np.ndarray, top_k: int = 5
+        self, query_embedding: np.ndarray, top_k: int = 5, normalized: bool = False
     ) -> List[Tuple[float, TextChunk]]:
         """
         Search index for similar chunks.
 
         Args:
-            query_embedding: Normalized query embedding
+            query_embedding: Query embedding
             top_k: Number of results to return
+            normalized: Query is already unit length, so skip normalizing it
 
         Returns:
             List of (score, chunk) tuples
         """
+        return [
+            (score, self.chunks_metadata[idx])
+            for score, idx in self.search_indices(query_embedding, top_k, normalized)
+        ]
+
+    def to_device(self, device: str, dtype=None) -> bool:
+        """
+        Keep a copy of the stored vectors on a torch device.
+
+        search_indices() then scores torch query tensors on that device with a
+        matrix-vector product and topk, so a query embedded on the GPU never
+        round-trips through host memory.
+
+        Args:
+            device: Torch device, e.g. "cuda"
+            dtype: Torch dtype for the copy (default float32)
+
+        Returns:
+            True if the vectors were copied
+        """
+        if torch is None:
+            logger.warning("torch is not installed; searching on the CPU index")
+            return False
+
+        try:
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        except RuntimeError as e:
+            logger.warning(
+                f"Index vectors cannot be reconstructed ({e}); "
+                "searching on the CPU index"
+            )
+            return False
+
+        self.device_vectors = torch.from_numpy(vectors).to(
+            device, dtype=dtype or torch.float32
+        )
+        logger.info(f"Copied {len(vectors)} index vectors to {device}")
+        return True
+
+    def search_indices(
+        self, query_embedding: np.ndarray, top_k: int = 5, normalized: bool = False
+    ) -> List[Tuple[float, int]]:
+        """
+        Search index for similar chunks, returning positions in chunks_metadata.
+
+        Stored vectors are unit length, so the inner product the index computes
+        is the cosine similarity once the query is unit length too.
+
+        Args:
+            query_embedding: Query embedding, or a torch tensor when the
+                vectors were copied with to_device()
+            top_k: Number of results to return
+            normalized: Query is already unit length (e.g. encoded with
+                normalize_embeddings=True), so skip normalizing it here
+
+        Returns:
+            List of (score, chunk_index) tuples
+        """
+        return self.search_indices_batch(
+            query_embedding.reshape(1, -1), top_k=top_k, normalized=normalized
+        )[0]
+
+    def search_indices_batch(
+        self, query_embeddings: np.ndarray, top_k: int = 5, normalized: bool = False
+    ) -> List[List[Tuple[float, int]]]:
+        """
+        Search several queries in one index call.
+
+        Args:
+            query_embeddings: (num_queries, dimension) embeddings, or a torch
+                tensor when the vectors were copied with to_device()
+            top_k: Number of results to return per query
+            normalized: Queries are already unit length
+
+        Returns:
+            List of (score, chunk_index) tuples per query
+        """
         if self.index is None:
             raise ValueError("Index not loaded. Call load_index() first.")
 
-        # Normalize query embedding
-        query_embedding = query_embedding.reshape(1, -1)
-        faiss.normalize_L2(query_embedding)
+        if torch is not None and torch.is_tensor(query_embeddings):
+            if self.device_vectors is not None:
+                return self._search_on_device(query_embeddings, top_k, normalized)
+            query_embeddings = query_embeddings.float().cpu().numpy()
+
+        query_embeddings = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        if not normalized:
+            faiss.normalize_L2(query_embeddings)
 
         # Search index
-        scores, indices = self.index.search(query_embedding, top_k)
+        scores, indices = self.index.search(
+            query_embeddings, top_k, params=self._search_params(top_k)
+        )
 
+        # FAISS pads missing results with index -1
         results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx >= 0:  # Valid index
-                chunk = self.chunks_metadata[idx]
-                results.append((float(score), chunk))
-
+        for row_scores, row_indices in zip(scores, indices):
+            valid = row_indices >= 0
+            results.append(
+                list(zip(row_scores[valid].tolist(), row_indices[valid].tolist()))
+            )
         return results
 
+    def search_indices_subset(
+        self,
+        query_embedding: np.ndarray,
+        ids: np.ndarray,
+        top_k: int = 5,
+        normalized: bool = False,
+    ) -> List[Tuple[float, int]]:
+        """
+        Search only the given rows of the index, e.g. the chunks of some laws.
+
+        Subsets up to index.subset_exact_max rows are scored exactly against
+        their stored vectors, which beats an index scan when the subset is a
+        small part of the corpus. Larger subsets are searched through the
+        index with an IDSelectorBatch, so no other row is ever scored.
+
+        Args:
+            query_embedding: Query embedding, or a torch tensor when the
+                vectors were copied with to_device()
+            ids: Rows to search (positions in chunks_metadata)
+            top_k: Number of results to return
+            normalized: Query is already unit length
+
+        Returns:
+            List of (score, chunk_index) tuples
+        """
+        if self.index is None:
+            raise ValueError("Index not loaded. Call load_index() first.")
+
+        ids = np.asarray(ids, dtype=np.int64)
+        k = min(top_k, len(ids))
+        if k == 0:
+            return []
+
+        if torch is not None and torch.is_tensor(query_embedding):
+            if self.device_vectors is not None:
+                query = query_embedding.reshape(-1).to(self.device_vectors)
+                if not normalized:
+                    query = torch.nn.functional.normalize(query, dim=0)
+                rows = torch.from_numpy(ids).to(self.device_vectors.device)
+                top = torch.topk(self.device_vectors[rows] @ query, k)
+                return list(
+                    zip(
+                        top.values.float().tolist(),
+                        ids[top.indices.cpu().numpy()].tolist(),
+                    )
+                )
+            query_embedding = query_embedding.float().cpu().numpy()
+
+        query = np.ascontiguousarray(query_embedding.reshape(1, -1), dtype=np.float32)
+        if not normalized:
+            faiss.normalize_L2(query)
+
+        if len(ids) <= self.index_config.get("subset_exact_max", 4096):
+            try:
+                vectors = self.index.reconstruct_batch(ids)
+            except RuntimeError:
+                # e.g. IVF indexes without a direct map
+                vectors = None
+            if vectors is not None:
+                scores = vectors @ query[0]
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top], kind="stable")]
+                return list(zip(scores[top].tolist(), ids[top].tolist()))
+
+        params = self._search_params(top_k, selector=faiss.IDSelectorBatch(ids))
+        scores, indices = self.index.search(query, k, params=params)
+        valid = indices[0] >= 0
+        return list(zip(scores[0][valid].tolist(), indices[0][valid].tolist()))
+
+    def _search_params(self, top_k: int, selector=None, index=None):
+        """
+        Build per-call search parameters for self.index.
+
+        Passed per call so concurrent searches don't share index state.
+
+        Args:
+            top_k: Number of results the search will return
+            selector: Optional IDSelector restricting the searched rows
+            index: Index to build them for (defaults to self.index)
+
+        Returns:
+            faiss.SearchParameters, or None when the index defaults will do
+        """
+        index = self.index if index is None else index
+        if isinstance(index, faiss.IndexPreTransform):
+            # e.g. "PCA64,IVF1024,Flat": the wrapped index takes the parameters
+            params = self._search_params(
+                top_k, selector=selector, index=faiss.downcast_index(index.index)
+            )
+            if params is None:
+                return None
+            return faiss.SearchParametersPreTransform(index_params=params)
+
+        if hasattr(index, "hnsw"):
+            # HNSW explores efSearch candidates, and at least 4x top_k, per query
+            params = faiss.SearchParametersHNSW(
+                efSearch=max(top_k * 4, self.index_config.get("ef_search", 64))
+            )
+        elif hasattr(index, "nprobe"):
+            # IVF scans nprobe of its nlist clusters per query
+            params = faiss.SearchParametersIVF(
+                nprobe=self.index_config.get("nprobe", index.nprobe)
+            )
+        elif selector is None:
+            return None
+        else:
+            params = faiss.SearchParameters()
+
+        if selector is not None:
+            params.sel = selector
+        return params
+
+    def _search_on_device(
+        self, query_embeddings, top_k: int, normalized: bool
+    ) -> List[List[Tuple[float, int]]]:
+        """Exact inner-product search against device_vectors, all on device."""
+        queries = query_embeddings.to(self.device_vectors)
+        if not normalized:
+            queries = torch.nn.functional.normalize(queries, dim=1)
+
+        scores = queries @ self.device_vectors.T
+        top = torch.topk(scores, min(top_k, scores.shape[1]), dim=1)
+        return [
+            list(zip(values, indices))
+            for values, indices in zip(
+                top.values.float().tolist(), top.indices.tolist()
+            )
+        ]
+
 
 def main():
     """Main function to build the vector index."""
@@ -20,8 +20,10 @@ try:
 except ImportError:
     SentenceTransformer = None
 
+from index.build_index import build_faiss_index
 from ingest.chunker import ChunkingConfig, TextChunker
 from ingest.loader import DocumentLoader
+from retriever.id_map_store import ColumnarIdMap
 from retriever.models import IndexStats, TextChunk
 
 logger = logging.getLogger(__name__)
@@ -170,16 +172,9 @@ class SimpleVectorIndexBuilder:
         """Build FAISS index from embeddings."""
         logger.info("Building FAISS index...")
 
-        dimension = embeddings.shape[1]
-
-        # Use IndexFlatIP for cosine similarity (inner product after normalization)
-        self.index = faiss.IndexFlatIP(dimension)
-
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(embeddings)
-
-        # Add embeddings to index
-        self.index.add(embeddings)
+        # Same index type as the full builder (index.factory in config.yaml),
+        # since both write the index the retrieval service loads
+        self.index = build_faiss_index(embeddings, self.index_config)
 
         logger.info(f"Built FAISS index with {self.index.ntotal} vectors")
 
@@ -197,6 +192,7 @@ class SimpleVectorIndexBuilder:
 
         # Save metadata as JSONL for easier access
         id_map_path = faiss_dir / "id_map.jsonl"
+        id_map_records = []
         with open(id_map_path, "w", encoding="utf-8") as f:
             for i, chunk in enumerate(self.chunks_metadata):
                 meta = {
@@ -216,6 +212,11 @@ class SimpleVectorIndexBuilder:
                     },
                 }
                 f.write(json.dumps(meta) + "\n")
+                id_map_records.append(meta)
+
+        # Columnar copy so the retriever can fetch metadata per hit instead of
+        # loading the whole JSONL into memory
+        ColumnarIdMap.from_records(id_map_records).save(faiss_dir / "id_map_soa")
 
         # Also save legacy pickle format for backward compatibility
         metadata_path = index_path / "chunks_metadata.pkl"
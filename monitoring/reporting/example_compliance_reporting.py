@@ -6,6 +6,7 @@ Demonstrates how to use the compliance reporting system with sample data
 import json
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -18,8 +19,12 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def create_sample_feature_data() -> List[Dict[str, Any]]:
-    """Create sample feature compliance data based on the image description"""
+    """Create sample feature compliance data based on the image description
+
+    The result is cached and shared between callers; treat it as read-only.
+    """
 
     return [
         {
@@ -135,8 +140,9 @@ def create_sample_feature_data() -> List[Dict[str, Any]]:
     ]
 
 
+@lru_cache(maxsize=1)
 def create_sample_regulatory_summaries() -> List[Dict[str, Any]]:
-    """Create sample regulatory summaries"""
+    """Create sample regulatory summaries (cached, treat as read-only)"""
 
     return [
         {
@@ -277,9 +283,9 @@ def main():
     regulatory_summaries = create_sample_regulatory_summaries()
     submission_calendar = create_sample_submission_calendar()
 
-    logger.info(f"Created {len(features_data)} sample features")
-    logger.info(f"Created {len(regulatory_summaries)} regulatory summaries")
-    logger.info(f"Created {len(submission_calendar)} submission deadlines")
+    logger.info("Created %s sample features", len(features_data))
+    logger.info("Created %s regulatory summaries", len(regulatory_summaries))
+    logger.info("Created %s submission deadlines", len(submission_calendar))
 
     # Ingest compliance data
     compliance_data = reporter.ingest_compliance_data(
@@ -297,23 +303,23 @@ def main():
         audiences=["Internal", "Regulator", "Executive"],
     )
 
-    logger.info(f"Generated compliance report: {report.report_id}")
-    logger.info(f"Summary stats: {report.summary_stats}")
+    logger.info("Generated compliance report: %s", report.report_id)
+    logger.info("Summary stats: %s", report.summary_stats)
 
     # Export report in different formats
     json_file = reporter.export_report(report, output_format="json")
     yaml_file = reporter.export_report(report, output_format="yaml")
 
-    logger.info(f"Exported JSON report: {json_file}")
-    logger.info(f"Exported YAML report: {yaml_file}")
+    logger.info("Exported JSON report: %s", json_file)
+    logger.info("Exported YAML report: %s", yaml_file)
 
     # Track deadlines
     deadline_tracking = reporter.track_deadlines(compliance_data["deadlines"])
-    logger.info(f"Deadline tracking summary: {deadline_tracking['summary']}")
+    logger.info("Deadline tracking summary: %s", deadline_tracking["summary"])
 
     # Generate audit trail
     audit_trail = reporter.generate_audit_trail(compliance_data["features"])
-    logger.info(f"Generated audit trail with {len(audit_trail)} entries")
+    logger.info("Generated audit trail with %s entries", len(audit_trail))
 
     # Schedule a report job (example)
     schedule_config = {
@@ -323,7 +329,7 @@ def main():
     }
 
     job_id = reporter.schedule_report_job(compliance_data, schedule_config)
-    logger.info(f"Scheduled report job: {job_id}")
+    logger.info("Scheduled report job: %s", job_id)
 
     # Print summary of generated files
     output_dir = Path(reporter.output_dir)
@@ -332,7 +338,7 @@ def main():
     logger.info("Generated files:")
     for file_path in generated_files:
         if file_path.is_file():
-            logger.info(f"  - {file_path.relative_to(output_dir)}")
+            logger.info("  - %s", file_path.relative_to(output_dir))
 
     # Display key metrics
     print("\n" + "=" * 60)
@@ -4,6 +4,7 @@ Test script for Compliance Reporter Agent
 
 import os
 import sys
+from dataclasses import fields
 from pathlib import Path
 
 # Add the src directory to the path
@@ -52,9 +53,10 @@ def test_basic_functionality():
 
         # Check report structure
         assert report.report_id == "TEST-2025-01-15"
-        assert "summary_stats" in report.__dict__
-        assert "feature_matrix" in report.__dict__
-        assert "dashboard_url" in report.__dict__
+        report_fields = {f.name for f in fields(report)}
+        assert "summary_stats" in report_fields
+        assert "feature_matrix" in report_fields
+        assert "dashboard_url" in report_fields
         print("✓ Report structure is correct")
 
         # Check summary stats
@@ -7,14 +7,15 @@ Query your compliance system for feature-related legal requirements
 import json
 import sys
 from pathlib import Path
-from retriever.faiss_retriever import FaissRetriever
+from retriever.faiss_retriever import FaissRetriever, prewarm
 
 def create_config():
     """Create configuration for FAISS retriever."""
     return {
         'embedding': {
             'model_name': 'sentence-transformers/all-MiniLM-L6-v2',
-            'dimension': 384
+            'dimension': 384,
+            'device': 'cpu'  # or 'cuda' to also run FAISS search on GPU
         },
         'rag': {
             'vectorstore': {
@@ -22,6 +23,9 @@ def create_config():
                 'id_map_path': 'index/faiss/id_map.jsonl',
                 'metric': 'ip',
                 'normalize': True
+                # For an IVF/HNSW index (see index.factory in config.yaml,
+                # rebuild with `python -m index.build_index --rebuild`) add:
+                # 'nprobe': 16, 'efSearch': 64
             }
         }
     }
@@ -36,14 +40,14 @@ def query_features(query, top_k=5):
         retriever = FaissRetriever(config)
         print('✅ FAISS retriever initialized successfully!')
         
-        results = retriever.retrieve(query, top_k=top_k)
+        results = retriever.retrieve(query, top_k=top_k, max_chars=300)
         
         print(f'\n📊 Found {len(results)} results:')
         for i, result in enumerate(results, 1):
             print(f'\n[{i}] {result.law_name} ({result.jurisdiction})')
             print(f'    Section: {result.section_label}')
             print(f'    Score: {result.score:.3f}')
-            print(f'    Text: {result.snippet[:300]}...')
+            print(f'    Text: {result.snippet}...')
             
         return results
         
@@ -63,6 +67,9 @@ def main():
         print("\nOr run interactively:")
         print("  python query_features.py")
         return
+
+    # Start loading the index and model while arguments/input are handled
+    prewarm(create_config())
     
     if len(sys.argv) == 1:
         # Interactive mode
@@ -87,9 +87,14 @@ def test_quick_production_pipeline():
         rag_retriever = FaissRetriever(faiss_config)
         print("✅ Existing RAG system loaded")
         
-        # Test retrieval
+        # Test retrieval. Both queries used below are encoded and searched
+        # in a single batch.
         query = "age verification requirements for minors on social platforms"
-        results = rag_retriever.retrieve(query, top_k=3)
+        integration_query = "content moderation requirements for EU social media platforms"
+        batch_results = rag_retriever.retrieve_batch(
+            [query, integration_query], top_k=5
+        )
+        results = batch_results[0][:3]
         
         print(f"✅ RAG Test Result:")
         print(f"   Retrieved: {len(results)} documents")
@@ -104,8 +109,7 @@ def test_quick_production_pipeline():
     print("\n🔄 Testing Complete Integration...")
     try:
         # Combine RAG + LLM
-        query = "content moderation requirements for EU social media platforms"
-        rag_results = rag_retriever.retrieve(query, top_k=5)
+        rag_results = batch_results[1]
         
         # Format context
         context = "REGULATORY CONTEXT:\n" + "\n".join([
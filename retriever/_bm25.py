@@ -0,0 +1,58 @@
+"""
+BM25 score accumulation kernel.
+
+Compiled with Numba when it is installed; otherwise the same function runs
+as plain Python, which is far slower than BM25Scorer's NumPy path, so
+callers should only use it when COMPILED is true.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _accumulate_scores(
+    scores: np.ndarray,
+    token_rows: np.ndarray,
+    offsets: np.ndarray,
+    doc_ids: np.ndarray,
+    tfs: np.ndarray,
+    idfs: np.ndarray,
+    dl_over_avgdl: np.ndarray,
+    k1: float,
+    b: float,
+):
+    """
+    Add each query token's BM25 contribution to scores in place.
+
+    Postings are stored CSR-style: token row t owns doc_ids[offsets[t]:
+    offsets[t + 1]] and the term frequencies at the same positions in tfs.
+    One pass per posting, with no temporary arrays.
+
+    Args:
+        scores: Per-document float32 accumulator
+        token_rows: Postings row of each query token (repeats allowed)
+        offsets: Start of each row in doc_ids/tfs, plus the total length
+        doc_ids: Document index of every posting
+        tfs: Term frequency of every posting
+        idfs: IDF of each row
+        dl_over_avgdl: Document length over average document length
+        k1: Term frequency saturation parameter
+        b: Length normalization parameter
+    """
+    for t in token_rows:
+        idf = idfs[t]
+        for j in range(offsets[t], offsets[t + 1]):
+            doc = doc_ids[j]
+            tf = tfs[j]
+            denom = tf + k1 * (1 - b + b * dl_over_avgdl[doc])
+            scores[doc] += idf * tf * (k1 + 1) / denom
+
+
+COMPILED = njit is not None
+accumulate_scores = (
+    njit(cache=True)(_accumulate_scores) if COMPILED else _accumulate_scores
+)
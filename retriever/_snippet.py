@@ -0,0 +1,63 @@
+"""
+Snippet truncation kernel for ASCII text.
+
+Compiled with Numba when it is installed; otherwise the same function runs
+as plain Python, which is slower than the regex path in service.py, so
+callers should only use it when COMPILED is true.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Cut kinds returned by truncation_point
+CUT_SENTENCE = 0
+CUT_WORD = 1
+CUT_HARD = 2
+
+_SPACE = ord(" ")
+_PERIOD = ord(".")
+_EXCLAMATION = ord("!")
+_QUESTION = ord("?")
+
+
+def _truncation_point(text: np.ndarray, max_chars: int):
+    """
+    Find where to cut text that is longer than max_chars.
+
+    Makes one backwards pass over the bytes of text[:max_chars], stopping at
+    the last sentence end (".", "!" or "?" followed by a space) past 70% of
+    max_chars. The last space is tracked on the way in case there is none.
+
+    Args:
+        text: ASCII bytes of the text as uint8
+        max_chars: Maximum snippet length
+
+    Returns:
+        (kind, index): CUT_SENTENCE keeps text[: index + 1], CUT_WORD keeps
+        text[:index] plus "...", CUT_HARD keeps text[:max_chars] plus "..."
+    """
+    last_space = -1
+    i = max_chars - 1
+    while i > max_chars * 0.7:
+        c = text[i]
+        if c == _SPACE:
+            if last_space < 0:
+                last_space = i
+        elif i < max_chars - 1 and text[i + 1] == _SPACE:
+            if c == _PERIOD or c == _EXCLAMATION or c == _QUESTION:
+                return CUT_SENTENCE, i
+        i -= 1
+
+    if last_space > max_chars * 0.8:
+        return CUT_WORD, last_space
+    return CUT_HARD, max_chars
+
+
+COMPILED = njit is not None
+truncation_point = (
+    njit(cache=True)(_truncation_point) if COMPILED else _truncation_point
+)
@@ -0,0 +1,55 @@
+"""
+Word-wrap kernel for CLI snippet rendering.
+
+Compiled with Numba when it is installed; otherwise the same function runs
+as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _wrap_breaks(word_lens: np.ndarray, width: int) -> np.ndarray:
+    """
+    Compute greedy line breaks for words of the given lengths.
+
+    Words are joined with single spaces and a line never exceeds ``width``
+    characters unless it holds a single over-long word.
+
+    Returns:
+        Exclusive end index of each line into the word sequence
+    """
+    n = len(word_lens)
+    breaks = np.empty(n + 1, dtype=np.int64)
+    num_breaks = 0
+    line_len = 0
+
+    for i in range(n):
+        word_len = word_lens[i]
+        if line_len + 1 + word_len > width:
+            if line_len > 0:
+                # Close the current line and start a new one with this word
+                breaks[num_breaks] = i
+                num_breaks += 1
+                line_len = word_len
+            else:
+                # Over-long word on an empty line gets a line of its own
+                breaks[num_breaks] = i + 1
+                num_breaks += 1
+        elif line_len > 0:
+            line_len += 1 + word_len
+        else:
+            line_len = word_len
+
+    if line_len > 0:
+        breaks[num_breaks] = n
+        num_breaks += 1
+
+    return breaks[:num_breaks]
+
+
+wrap_breaks = njit(cache=True)(_wrap_breaks) if njit is not None else _wrap_breaks
@@ -8,6 +8,9 @@ import logging
 import sys
 from typing import List, Optional
 
+import numpy as np
+
+from retriever._wrap import wrap_breaks
 from retriever.models import SearchResult
 from sdk.client import RegulationClient
 
@@ -18,6 +21,13 @@ def setup_logging(verbose: bool = False):
     logging.basicConfig(level=level, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
+def make_client(args) -> RegulationClient:
+    """Create an API client from the global CLI options."""
+    return RegulationClient(
+        base_url=args.url, timeout=args.timeout, keepalive=args.keepalive
+    )
+
+
 def format_result(result: SearchResult, include_score: bool = True) -> str:
     """Format a search result for display."""
     header = f"📄 {result.law_name} ({result.jurisdiction})"
@@ -31,22 +41,14 @@ def format_result(result: SearchResult, include_score: bool = True) -> str:
         metadata = f"📝 Lines {result.start_line}-{result.end_line}"
 
     # Format snippet with proper wrapping
-    snippet_lines = []
     words = result.snippet.split()
-    current_line = ""
-
-    for word in words:
-        if len(current_line + " " + word) > 80:
-            if current_line:
-                snippet_lines.append(current_line)
-                current_line = word
-            else:
-                snippet_lines.append(word)
-        else:
-            current_line = current_line + " " + word if current_line else word
+    word_lens = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
 
-    if current_line:
-        snippet_lines.append(current_line)
+    snippet_lines = []
+    line_start = 0
+    for line_end in wrap_breaks(word_lens, 80):
+        snippet_lines.append(" ".join(words[line_start:line_end]))
+        line_start = line_end
 
     snippet = "\\n".join(f"  {line}" for line in snippet_lines)
 
@@ -72,7 +74,7 @@ def print_results(results: List[SearchResult], include_score: bool = True):
 def retrieve_command(args):
     """Handle retrieve command."""
     try:
-        client = RegulationClient(base_url=args.url, timeout=args.timeout)
+        client = make_client(args)
 
         response = client.retrieve(
             query=args.query,
@@ -104,7 +106,7 @@ def retrieve_command(args):
 def health_command(args):
     """Handle health command."""
     try:
-        client = RegulationClient(base_url=args.url, timeout=args.timeout)
+        client = make_client(args)
         health = client.health()
 
         status = health.get("status", "unknown")
@@ -140,7 +142,7 @@ def health_command(args):
 def search_by_law_command(args):
     """Handle search by specific law."""
     try:
-        client = RegulationClient(base_url=args.url, timeout=args.timeout)
+        client = make_client(args)
         results = client.search_by_law(args.query, args.law, args.k)
 
         print(f"🔍 Searching in {args.law}:")
@@ -156,7 +158,7 @@ def search_by_law_command(args):
 def search_by_jurisdiction_command(args):
     """Handle search by jurisdiction."""
     try:
-        client = RegulationClient(base_url=args.url, timeout=args.timeout)
+        client = make_client(args)
         results = client.search_jurisdiction(args.query, args.jurisdiction, args.k)
 
         print(f"🔍 Searching in {args.jurisdiction}:")
@@ -202,6 +204,12 @@ Examples:
         default=30,
         help="Request timeout in seconds (default: 30)",
     )
+    parser.add_argument(
+        "--keepalive",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Reuse pooled HTTP connections (default: on)",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
     parser.add_argument("--json", action="store_true", help="Output JSON response")
 
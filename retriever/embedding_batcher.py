@@ -0,0 +1,128 @@
+"""
+Micro-batching of query embeddings across concurrent requests.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent encode calls into batched model.encode calls.
+
+    Each caller blocks on its own future while a single worker thread drains
+    the queue: it takes the first waiting query, then keeps collecting for up
+    to max_wait_ms or until max_batch_size queries are queued, and encodes
+    them all in one forward pass. SentenceTransformer.encode already sorts a
+    batch by length, so padding stays minimal.
+
+    With search_fn, the stacked embeddings of a batch also go through one
+    vectorized call (e.g. an index search), and each caller gets its row of
+    that result instead of its embedding. Callers that pass search=False
+    still share the forward pass but get their embedding back.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        search_fn: Optional[Callable[[Any], List[Any]]] = None,
+        **encode_kwargs: Any,
+    ):
+        """
+        Start the batching worker.
+
+        Args:
+            model: Object with a SentenceTransformer-style encode()
+            max_batch_size: Maximum queries per encode call
+            max_wait_ms: How long to wait for more queries after the first
+            search_fn: Optional function mapping a batch's embeddings to one
+                result per row
+            **encode_kwargs: Extra keyword arguments passed to encode()
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.search_fn = search_fn
+        self.encode_kwargs = encode_kwargs
+
+        self._queue: "queue.Queue[Tuple[str, bool, Future]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="embedding-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def encode(self, query: str, search: bool = True) -> Any:
+        """
+        Embed one query, sharing a model call with concurrent callers.
+
+        Args:
+            query: Text to embed
+            search: Run the embedding through search_fn, if set
+
+        Returns:
+            The query's embedding row, or its search_fn result if searched
+        """
+        future: Future = Future()
+        self._queue.put((query, search, future))
+        return future.result()
+
+    def _run(self):
+        """Worker loop: collect a batch, encode it, resolve its futures."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_s
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[Tuple[str, bool, Future]]):
+        """Encode a batch and hand each caller its row."""
+        queries = [query for query, _, _ in batch]
+        try:
+            embeddings = self.model.encode(
+                queries,
+                batch_size=len(queries),
+                convert_to_numpy=True,
+                show_progress_bar=False,
+                **self.encode_kwargs,
+            )
+
+            # fp16 models return fp16 rows; FAISS searches float32. Tensors
+            # (convert_to_tensor=True) stay on their device as they are.
+            if not self.encode_kwargs.get("convert_to_tensor"):
+                embeddings = np.asarray(embeddings, dtype=np.float32)
+
+            searched = [i for i, (_, search, _) in enumerate(batch) if search]
+            if self.search_fn is None or not searched:
+                results = embeddings
+            elif len(searched) == len(batch):
+                results = self.search_fn(embeddings)
+            else:
+                results = list(embeddings)
+                for i, result in zip(searched, self.search_fn(embeddings[searched])):
+                    results[i] = result
+        except Exception as e:
+            logger.error(f"Batched query encoding failed: {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
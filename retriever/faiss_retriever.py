@@ -2,20 +2,95 @@
 FAISS-based retriever for regulatory documents.
 """
 
-import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import faiss
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 from ingest.chunker import ChunkingConfig, TextChunker
+from retriever.id_map_store import ColumnarIdMap, columns_stale
 from retriever.models import SearchResult, TextChunk
+from retriever.onnx_encoder import OnnxSentenceEncoder
 
 logger = logging.getLogger(__name__)
 
+# Default intra-op threads for the embedding forward pass
+_DEFAULT_NUM_THREADS = min(os.cpu_count() or 1, 8)
+
+# Keep tokenizers single-threaded to avoid fork-after-init issues. Set once at
+# import so concurrent index/model loads never mutate the environment.
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+# Process-wide caches so repeated FaissRetriever construction reuses loaded state
+_MODEL_CACHE: Dict[Tuple[str, str], Any] = {}
+_INDEX_CACHE: Dict[Tuple[str, int, Optional[bool]], Any] = {}
+
+# Guard cache fills so a background prewarm and a foreground load don't race
+_MODEL_LOCK = threading.Lock()
+_INDEX_LOCK = threading.Lock()
+
+# Rows preallocated in each thread's query embedding buffer
+_QUERY_BUFFER_ROWS = 64
+
+# Shared GPU scratch memory; kept alive for as long as GPU indexes may be used
+_GPU_RESOURCES = None
+
+
+def _gpu_available() -> bool:
+    """Whether this FAISS build can place indexes on a GPU."""
+    return hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0
+
+
+def _get_gpu_resources():
+    """Lazily create the process-wide FAISS GPU resources."""
+    global _GPU_RESOURCES
+    if _GPU_RESOURCES is None:
+        # Lets index.search accept CUDA torch tensors without a host copy
+        import faiss.contrib.torch_utils  # noqa: F401
+
+        _GPU_RESOURCES = faiss.StandardGpuResources()
+    return _GPU_RESOURCES
+
+
+def prewarm(config: Dict[str, Any]) -> threading.Thread:
+    """
+    Load the index and embedding model in a background daemon thread.
+
+    A warm-up search also runs once so the model's first forward pass and
+    the index scratch buffers are out of the way. A FaissRetriever built
+    later with the same config then reuses the cached index and model.
+
+    Args:
+        config: Retriever configuration, as passed to FaissRetriever
+
+    Returns:
+        The started warm-up thread
+    """
+
+    def _warm():
+        try:
+            FaissRetriever(config).retrieve("warmup", top_k=1)
+        except Exception as e:
+            logger.warning("FAISS retriever prewarm failed: %s", e)
+
+    thread = threading.Thread(target=_warm, name="faiss-prewarm", daemon=True)
+    thread.start()
+    return thread
+
 
 class FaissRetriever:
     """FAISS-based retriever for regulatory document search."""
@@ -33,17 +108,41 @@ class FaissRetriever:
         self.id_map_path = self.vectorstore_config.get(
             "id_map_path", "index/faiss/id_map.jsonl"
         )
+        # Memory-mapped columnar id_map, preferred over the JSONL when present
+        self.id_columns_path = self.vectorstore_config.get(
+            "id_columns_path", str(Path(self.id_map_path).with_name("id_map_soa"))
+        )
         self.metric = self.vectorstore_config.get("metric", "ip")
         self.normalize = self.vectorstore_config.get("normalize", True)
         self.dimension = self.embedding_config.get("dimension", 384)
 
+        # Search on GPU when the embedding device is CUDA and FAISS can use it
+        self.use_gpu = (
+            self.embedding_config.get("device", "cpu").startswith("cuda")
+            and _gpu_available()
+        )
+
         # Load components
         self.index = None
+        self.search_params = None
         self.id_map = []
+        self.id_columns = None
         self.embedding_model = None
 
-        self._load_index()
-        self._load_embedding_model()
+        # Per-thread float32 query buffer reused across searches
+        self._local = threading.local()
+
+        # Per-instance result cache for repeated identical queries
+        self._cached_retrieve = lru_cache(
+            maxsize=self.vectorstore_config.get("cache_size", 256)
+        )(self._retrieve_uncached)
+
+        # The index and model loads are independent; overlap them
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            index_future = executor.submit(self._load_index)
+            model_future = executor.submit(self._load_embedding_model)
+            index_future.result()
+            model_future.result()
 
     def _load_index(self):
         """Load FAISS index and ID mapping."""
@@ -51,22 +150,108 @@ class FaissRetriever:
             if not Path(self.index_path).exists():
                 raise FileNotFoundError(f"FAISS index not found: {self.index_path}")
 
-            # Load FAISS index
-            self.index = faiss.read_index(self.index_path)
-            logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors")
+            # Load FAISS index, sharing it only with retrievers that read and
+            # place it the same way (mmap, GPU fp16 storage)
+            read_flags = self._read_flags()
+            gpu_float16 = (
+                bool(self.vectorstore_config.get("gpu_float16", True))
+                if self.use_gpu
+                else None
+            )
+            cache_key = (self.index_path, read_flags, gpu_float16)
+            with _INDEX_LOCK:
+                self.index = _INDEX_CACHE.get(cache_key)
+                if self.index is None:
+                    self.index = faiss.read_index(self.index_path, read_flags)
 
-            # Load ID mapping
-            if Path(self.id_map_path).exists():
-                with open(self.id_map_path, "r", encoding="utf-8") as f:
-                    self.id_map = [json.loads(line.strip()) for line in f]
-                logger.info(f"Loaded ID mapping with {len(self.id_map)} entries")
+                    # IVF indexes: parallelize a single query across inverted
+                    # lists rather than across queries. No-op for Flat.
+                    try:
+                        faiss.extract_index_ivf(self.index).parallel_mode = 1
+                    except RuntimeError:
+                        pass
+
+                    if self.use_gpu:
+                        # fp16 storage halves GPU memory traffic per search
+                        cloner_options = faiss.GpuClonerOptions()
+                        cloner_options.useFloat16 = gpu_float16
+                        self.index = faiss.index_cpu_to_gpu(
+                            _get_gpu_resources(), 0, self.index, cloner_options
+                        )
+                    _INDEX_CACHE[cache_key] = self.index
+            self.search_params = self._build_search_params()
+            logger.info("Loaded FAISS index with %d vectors", self.index.ntotal)
+
+            # Load ID mapping, preferring the columnar copy unless the JSONL
+            # was rewritten after it was converted
+            use_columns = Path(self.id_columns_path).is_dir()
+            if use_columns and columns_stale(self.id_columns_path, self.id_map_path):
+                logger.warning(
+                    "Columnar ID mapping %s is older than %s; loading the JSONL",
+                    self.id_columns_path,
+                    self.id_map_path,
+                )
+                use_columns = False
+
+            if use_columns:
+                self.id_columns = ColumnarIdMap.load(self.id_columns_path)
+                logger.info(
+                    "Mapped columnar ID mapping with %d entries", len(self.id_columns)
+                )
+            elif Path(self.id_map_path).exists():
+                with open(self.id_map_path, "rb") as f:
+                    self.id_map = [_json.loads(line) for line in f]
+                logger.info("Loaded ID mapping with %d entries", len(self.id_map))
             else:
-                logger.warning(f"ID mapping not found: {self.id_map_path}")
+                logger.warning("ID mapping not found: %s", self.id_map_path)
 
         except Exception as e:
-            logger.error(f"Failed to load FAISS index: {e}")
+            logger.error("Failed to load FAISS index: %s", e)
             raise
 
+    def _read_flags(self) -> int:
+        """faiss.read_index flags; memory-maps the index unless disabled.
+
+        With IO_FLAG_MMAP the kernel pages index data in on demand instead
+        of copying the whole file to the heap. The file must live on a local
+        filesystem.
+        """
+        if self.vectorstore_config.get("mmap", True):
+            return faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        return 0
+
+    def _build_search_params(self):
+        """Per-call approximate-search parameters (nprobe, efSearch), if configured.
+
+        They are passed to every index.search instead of being set on the
+        index, which _INDEX_CACHE shares with retrievers of other configs.
+        """
+        nprobe = self.vectorstore_config.get("nprobe")
+        ef_search = self.vectorstore_config.get("efSearch")
+
+        if ef_search is not None and hasattr(self.index, "hnsw"):
+            return faiss.SearchParametersHNSW(efSearch=ef_search)
+        if ef_search is not None:
+            logger.warning("Index does not support search parameter efSearch")
+
+        if nprobe is None:
+            return None
+        if hasattr(self.index, "nprobe"):
+            return faiss.SearchParametersIVF(nprobe=nprobe)
+        if isinstance(self.index, faiss.IndexPreTransform):
+            try:
+                faiss.extract_index_ivf(self.index)
+            except RuntimeError:
+                pass
+            else:
+                # Keep the inner parameters alive alongside the wrapper
+                self._ivf_search_params = faiss.SearchParametersIVF(nprobe=nprobe)
+                return faiss.SearchParametersPreTransform(
+                    index_params=self._ivf_search_params
+                )
+        logger.warning("Index does not support search parameter nprobe")
+        return None
+
     def _load_embedding_model(self):
         """Load sentence transformer model."""
         model_name = self.embedding_config.get(
@@ -74,65 +259,233 @@ class FaissRetriever:
         )
         device = self.embedding_config.get("device", "cpu")
 
-        # Set safe threading flags to prevent segfaults
-        import os
+        # Let the transformer forward pass use several cores
+        torch.set_num_threads(
+            self.embedding_config.get("num_threads") or _DEFAULT_NUM_THREADS
+        )
 
-        os.environ["TOKENIZERS_PARALLELISM"] = "false"
-        os.environ["OMP_NUM_THREADS"] = "1"
-        os.environ["MKL_NUM_THREADS"] = "1"
+        # A quantized ONNX export, when configured, replaces the PyTorch model
+        onnx_path = self.embedding_config.get("onnx_path")
+        key = (onnx_path, "onnx") if onnx_path else (model_name, device)
 
-        logger.info(f"Loading embedding model: {model_name}")
-        self.embedding_model = SentenceTransformer(model_name, device=device)
+        with _MODEL_LOCK:
+            self.embedding_model = _MODEL_CACHE.get(key)
+            if self.embedding_model is None:
+                if onnx_path:
+                    logger.info("Loading ONNX embedding model: %s", onnx_path)
+                    self.embedding_model = OnnxSentenceEncoder(
+                        onnx_path,
+                        file_name=self.embedding_config.get(
+                            "onnx_file", "model_quantized.onnx"
+                        ),
+                    )
+                else:
+                    logger.info("Loading embedding model: %s", model_name)
+                    self.embedding_model = SentenceTransformer(
+                        model_name, device=device
+                    )
+                _MODEL_CACHE[key] = self.embedding_model
 
-    def retrieve(self, query: str, top_k: int = 5) -> List[SearchResult]:
+    def retrieve(
+        self, query: str, top_k: int = 5, max_chars: int = 1200
+    ) -> List[SearchResult]:
         """
         Retrieve relevant regulatory context for a query.
 
         Args:
             query: Search query text
             top_k: Number of results to return
+            max_chars: Maximum snippet length
 
         Returns:
-            List of SearchResult objects
+            List of SearchResult objects, owned by the caller
+        """
+        # Cached results are shared between calls; callers set latency_ms and
+        # may edit snippets, so each call gets its own copies
+        results = [
+            replace(result)
+            for result in self._cached_retrieve(query.strip(), top_k, max_chars)
+        ]
+
+        logger.info("Retrieved %d results for query: %s", len(results), query)
+        return results
+
+    def _retrieve_uncached(
+        self, query: str, top_k: int, max_chars: int
+    ) -> Tuple[SearchResult, ...]:
+        """Run a search; the tuple result is what the LRU cache stores."""
+        return tuple(self.iter_retrieve(query, top_k=top_k, max_chars=max_chars))
+
+    def iter_retrieve(
+        self, query: str, top_k: int = 5, max_chars: int = 1200
+    ) -> Iterator[SearchResult]:
         """
+        Lazily yield results for a query, building each SearchResult on demand.
+
+        Args:
+            query: Search query text
+            top_k: Number of results to return
+            max_chars: Maximum snippet length
+
+        Yields:
+            SearchResult objects in rank order
+        """
+        scores, indices = self._search([query], top_k)
+        yield from self._iter_search_results(scores[0], indices[0], max_chars)
+
+    def retrieve_batch(
+        self, queries: List[str], top_k: int = 5, max_chars: int = 1200
+    ) -> List[List[SearchResult]]:
+        """
+        Retrieve regulatory context for several queries at once.
+
+        All queries are encoded in a single model call and searched with a
+        single FAISS search, which is considerably cheaper than issuing them
+        one by one.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of results to return per query
+            max_chars: Maximum snippet length
+
+        Returns:
+            One list of SearchResult objects per query, in input order
+        """
+        if not queries:
+            return []
+
+        scores, indices = self._search(queries, top_k)
+
+        return [
+            list(self._iter_search_results(row_scores, row_indices, max_chars))
+            for row_scores, row_indices in zip(scores, indices)
+        ]
+
+    def _search(self, queries: List[str], top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode queries and search the index, returning (scores, indices)."""
         if self.index is None or self.embedding_model is None:
             raise RuntimeError("FAISS retriever not properly initialized")
 
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode(
-            [query], convert_to_numpy=True, show_progress_bar=False
+        if self.use_gpu and isinstance(self.embedding_model, SentenceTransformer):
+            return self._search_on_gpu(queries, top_k)
+
+        # Generate query embeddings, normalized during pooling if configured
+        query_embeddings = self.embedding_model.encode(
+            queries,
+            batch_size=32,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            normalize_embeddings=self.normalize or self.metric == "ip",
         )
 
-        # Normalize if configured
-        if self.normalize or self.metric == "ip":
-            faiss.normalize_L2(query_embedding)
+        query_buffer = self._query_buffer(query_embeddings)
 
         # Search index
-        scores, indices = self.index.search(query_embedding.astype("float32"), top_k)
-
-        # Convert to SearchResult objects
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx >= 0 and idx < len(self.id_map):  # Valid index
-                meta = self.id_map[idx]
-
-                # Create SearchResult
-                result = SearchResult(
-                    snippet=meta.get("text", ""),
-                    law_name=meta.get("law_name", "Unknown"),
-                    law_id=meta.get("law_id", "Unknown"),
-                    section_label=meta.get("section_label", ""),
-                    jurisdiction=meta.get("jurisdiction", "Unknown"),
-                    source_path=meta.get("source_path", ""),
-                    score=float(score),
+        return self._index_search(query_buffer, top_k)
+
+    def _search_on_gpu(
+        self, queries: List[str], top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Search with query embeddings that never leave the GPU.
+
+        The CUDA tensor from the model is handed straight to the GPU index,
+        so only the top_k scores and ids are copied back to the host (unless
+        nprobe/efSearch are configured; see _index_search).
+        """
+        query_embeddings = self.embedding_model.encode(
+            queries,
+            batch_size=32,
+            convert_to_tensor=True,
+            show_progress_bar=False,
+            normalize_embeddings=self.normalize or self.metric == "ip",
+        )
+        scores, indices = self._index_search(query_embeddings.float(), top_k)
+        if torch.is_tensor(scores):
+            scores, indices = scores.cpu().numpy(), indices.cpu().numpy()
+        return scores, indices
+
+    def _index_search(self, queries, top_k: int) -> Tuple[Any, Any]:
+        """index.search with this retriever's per-call search parameters.
+
+        faiss.contrib.torch_utils (loaded for GPU search) replaces
+        index.search with a version that takes no parameters and keeps the
+        original as search_numpy, so with parameters set, torch queries are
+        copied to the host and searched through that.
+        """
+        if self.search_params is None:
+            return self.index.search(queries, top_k)
+
+        if torch.is_tensor(queries):
+            queries = queries.cpu().numpy()
+        search = getattr(self.index, "search_numpy", self.index.search)
+        return search(queries, top_k, params=self.search_params)
+
+    def _query_buffer(self, embeddings: np.ndarray) -> np.ndarray:
+        """Copy embeddings into this thread's contiguous float32 buffer."""
+        num_queries, dimension = embeddings.shape
+        buffer = getattr(self._local, "query_buffer", None)
+        if (
+            buffer is None
+            or buffer.shape[0] < num_queries
+            or buffer.shape[1] != dimension
+        ):
+            buffer = np.empty(
+                (max(num_queries, _QUERY_BUFFER_ROWS), dimension), dtype=np.float32
+            )
+            self._local.query_buffer = buffer
+
+        query_buffer = buffer[:num_queries]
+        np.copyto(query_buffer, embeddings)
+        return query_buffer
+
+    def _iter_search_results(
+        self, scores: np.ndarray, indices: np.ndarray, max_chars: int
+    ) -> Iterator[SearchResult]:
+        """Yield SearchResult objects for one row of FAISS search output.
+
+        Snippets are truncated to max_chars here, once per result, so
+        display code can use them as-is.
+        """
+        num_rows = (
+            len(self.id_columns) if self.id_columns is not None else len(self.id_map)
+        )
+        valid = (indices >= 0) & (indices < num_rows)
+        rows = indices[valid].tolist()
+        row_scores = scores[valid].tolist()
+
+        if self.id_columns is not None:
+            columns = self.id_columns.take(rows)
+            for i, score in enumerate(row_scores):
+                yield SearchResult(
+                    snippet=columns["snippet"][i][:max_chars],
+                    law_name=columns["law_name"][i],
+                    law_id=columns["law_id"][i],
+                    section_label=columns["section_label"][i],
+                    jurisdiction=columns["jurisdiction"][i],
+                    source_path=columns["source_path"][i],
+                    score=score,
                     latency_ms=0,  # Will be set by caller
-                    start_line=meta.get("meta", {}).get("start_line", 0),
-                    end_line=meta.get("meta", {}).get("end_line", 0),
+                    start_line=columns["start_line"][i],
+                    end_line=columns["end_line"][i],
                 )
-                results.append(result)
+            return
 
-        logger.info(f"Retrieved {len(results)} results for query: {query}")
-        return results
+        for score, idx in zip(row_scores, rows):
+            meta = self.id_map[idx]
+
+            # Create SearchResult
+            yield SearchResult(
+                snippet=meta.get("text", "")[:max_chars],
+                law_name=meta.get("law_name", "Unknown"),
+                law_id=meta.get("law_id", "Unknown"),
+                section_label=meta.get("section_label", ""),
+                jurisdiction=meta.get("jurisdiction", "Unknown"),
+                source_path=meta.get("source_path", ""),
+                score=score,
+                latency_ms=0,  # Will be set by caller
+                start_line=meta.get("meta", {}).get("start_line", 0),
+                end_line=meta.get("meta", {}).get("end_line", 0),
+            )
 
     def get_stats(self) -> Dict[str, Any]:
         """Get retriever statistics."""
@@ -141,7 +494,16 @@ class FaissRetriever:
             "dimension": self.dimension,
             "metric": self.metric,
             "normalize": self.normalize,
-            "id_map_entries": len(self.id_map),
+            "use_gpu": self.use_gpu,
+            "cache_info": self._cached_retrieve.cache_info()._asdict(),
+            "id_map_entries": (
+                len(self.id_columns)
+                if self.id_columns is not None
+                else len(self.id_map)
+            ),
             "index_path": self.index_path,
             "id_map_path": self.id_map_path,
+            "id_columns_path": (
+                self.id_columns_path if self.id_columns is not None else None
+            ),
         }
@@ -2,7 +2,7 @@
 Mock FAISS retriever for testing integration without sentence-transformers.
 """
 
-import json
+import hashlib
 import logging
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
@@ -10,6 +10,12 @@ from typing import Any, Dict, List, Tuple
 import faiss
 import numpy as np
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+from retriever.id_map_store import ColumnarIdMap, columns_stale
 from retriever.models import SearchResult
 
 logger = logging.getLogger(__name__)
@@ -31,13 +37,19 @@ class MockFaissRetriever:
         self.id_map_path = self.vectorstore_config.get(
             "id_map_path", "index/faiss/id_map.jsonl"
         )
+        self.id_columns_path = self.vectorstore_config.get(
+            "id_columns_path", str(Path(self.id_map_path).with_name("id_map_soa"))
+        )
         self.metric = self.vectorstore_config.get("metric", "ip")
         self.normalize = self.vectorstore_config.get("normalize", True)
         self.dimension = self.embedding_config.get("dimension", 384)
 
         # Load components
         self.index = None
-        self.id_map = []
+        self.id_columns = None
+
+        # Reused buffer for the mock query embedding
+        self._query_buffer = np.empty((1, self.dimension), dtype=np.float32)
 
         self._load_index()
 
@@ -48,14 +60,31 @@ class MockFaissRetriever:
                 raise FileNotFoundError(f"FAISS index not found: {self.index_path}")
 
             # Load FAISS index
-            self.index = faiss.read_index(self.index_path)
+            self.index = faiss.read_index(self.index_path, self._read_flags())
             logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors")
 
             # Load ID mapping
-            if Path(self.id_map_path).exists():
-                with open(self.id_map_path, "r", encoding="utf-8") as f:
-                    self.id_map = [json.loads(line.strip()) for line in f]
-                logger.info(f"Loaded ID mapping with {len(self.id_map)} entries")
+            # Load ID mapping as columns rather than one dict per row, unless
+            # the JSONL was rewritten after the columnar copy was converted
+            use_columns = Path(self.id_columns_path).is_dir()
+            if use_columns and columns_stale(self.id_columns_path, self.id_map_path):
+                logger.warning(
+                    f"Columnar ID mapping {self.id_columns_path} is older than "
+                    f"{self.id_map_path}; loading the JSONL"
+                )
+                use_columns = False
+
+            if use_columns:
+                self.id_columns = ColumnarIdMap.load(self.id_columns_path)
+                logger.info(
+                    f"Mapped columnar ID mapping with {len(self.id_columns)} entries"
+                )
+            elif Path(self.id_map_path).exists():
+                with open(self.id_map_path, "rb") as f:
+                    self.id_columns = ColumnarIdMap.from_records(
+                        _json.loads(line) for line in f
+                    )
+                logger.info(f"Loaded ID mapping with {len(self.id_columns)} entries")
             else:
                 logger.warning(f"ID mapping not found: {self.id_map_path}")
 
@@ -63,6 +92,12 @@ class MockFaissRetriever:
             logger.error(f"Failed to load FAISS index: {e}")
             raise
 
+    def _read_flags(self) -> int:
+        """faiss.read_index flags; memory-maps the index unless disabled."""
+        if self.vectorstore_config.get("mmap", True):
+            return faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        return 0
+
     def retrieve(self, query: str, top_k: int = 5) -> List[SearchResult]:
         """
         Retrieve relevant regulatory context for a query using mock embeddings.
@@ -74,44 +109,98 @@ class MockFaissRetriever:
         Returns:
             List of SearchResult objects
         """
-        if self.index is None:
-            raise RuntimeError("FAISS retriever not properly initialized")
+        results = self.retrieve_batch([query], top_k=top_k)[0]
 
-        # Generate mock query embedding (random but deterministic)
-        np.random.seed(hash(query) % 2**32)  # Deterministic based on query
-        query_embedding = np.random.randn(1, self.dimension).astype("float32")
+        logger.info(f"Retrieved {len(results)} results for query: {query}")
+        return results
 
-        # Normalize if configured
-        if self.normalize or self.metric == "ip":
-            faiss.normalize_L2(query_embedding)
+    def retrieve_batch(
+        self, queries: List[str], top_k: int = 5
+    ) -> List[List[SearchResult]]:
+        """
+        Retrieve regulatory context for several queries with one FAISS search.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of results to return per query
+
+        Returns:
+            One list of SearchResult objects per query, in input order
+        """
+        if self.index is None:
+            raise RuntimeError("FAISS retriever not properly initialized")
+        if not queries:
+            return []
+
+        # Generate mock query embeddings (random but deterministic)
+        if self._query_buffer.shape[0] < len(queries):
+            self._query_buffer = np.empty(
+                (len(queries), self.dimension), dtype=np.float32
+            )
+        # Leading rows of a C-ordered float32 array, so FAISS searches it
+        # without a copy
+        query_embeddings = self._query_buffer[: len(queries)]
+        for row, query in zip(query_embeddings, queries):
+            self._embed_query(query, row)
+
+        # Normalize the whole block in one call. Only inner-product search
+        # depends on the query norm; normalize=False turns it off explicitly.
+        if self.normalize and self.metric == "ip":
+            faiss.normalize_L2(query_embeddings)
 
         # Search index
-        scores, indices = self.index.search(query_embedding.astype("float32"), top_k)
-
-        # Convert to SearchResult objects
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx >= 0 and idx < len(self.id_map):  # Valid index
-                meta = self.id_map[idx]
-
-                # Create SearchResult
-                result = SearchResult(
-                    snippet=meta.get("text", ""),
-                    law_name=meta.get("law_name", "Unknown"),
-                    law_id=meta.get("law_id", "Unknown"),
-                    section_label=meta.get("section_label", ""),
-                    jurisdiction=meta.get("jurisdiction", "Unknown"),
-                    source_path=meta.get("source_path", ""),
-                    score=float(score),
-                    latency_ms=0,  # Will be set by caller
-                    start_line=meta.get("meta", {}).get("start_line", 0),
-                    end_line=meta.get("meta", {}).get("end_line", 0),
-                )
-                results.append(result)
+        scores, indices = self.index.search(query_embeddings, top_k)
+
+        return [
+            self._build_results(row_scores, row_indices)
+            for row_scores, row_indices in zip(scores, indices)
+        ]
+
+    def _build_results(
+        self, scores: np.ndarray, indices: np.ndarray
+    ) -> List[SearchResult]:
+        """Convert one row of FAISS search output to SearchResult objects."""
+        num_rows = len(self.id_columns) if self.id_columns is not None else 0
+
+        # Drop -1 sentinels and out-of-range ids with one mask
+        valid = (indices >= 0) & (indices < num_rows)
+        rows = indices[valid].tolist()
+        if not rows:
+            return []
+        row_scores = scores[valid].tolist()
+
+        columns = self.id_columns.take(rows)
+        results = [None] * len(rows)
+        for i, score in enumerate(row_scores):
+            results[i] = SearchResult(
+                snippet=columns["snippet"][i],
+                law_name=columns["law_name"][i],
+                law_id=columns["law_id"][i],
+                section_label=columns["section_label"][i],
+                jurisdiction=columns["jurisdiction"][i],
+                source_path=columns["source_path"][i],
+                score=score,
+                latency_ms=0,  # Will be set by caller
+                start_line=columns["start_line"][i],
+                end_line=columns["end_line"][i],
+            )
 
-        logger.info(f"Retrieved {len(results)} results for query: {query}")
         return results
 
+    def _embed_query(self, query: str, out: np.ndarray):
+        """Fill out with a mock embedding seeded by the query text.
+
+        Uses a local generator, so the global NumPy random state is left
+        alone and no new array is allocated.
+        """
+        # blake2b rather than hash(): str hashes change with PYTHONHASHSEED,
+        # which would give each process a different embedding per query
+        seed = int.from_bytes(
+            hashlib.blake2b(query.encode("utf-8"), digest_size=4).digest(), "little"
+        )
+        rng = np.random.default_rng(seed)
+        rng.standard_normal(out=out, dtype=np.float32)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get retriever statistics."""
         return {
@@ -119,7 +208,9 @@ class MockFaissRetriever:
             "dimension": self.dimension,
             "metric": self.metric,
             "normalize": self.normalize,
-            "id_map_entries": len(self.id_map),
+            "id_map_entries": (
+                len(self.id_columns) if self.id_columns is not None else 0
+            ),
             "index_path": self.index_path,
             "id_map_path": self.id_map_path,
         }
@@ -0,0 +1,179 @@
+"""
+Columnar (struct-of-arrays) storage for the FAISS id_map.
+
+The JSONL id_map holds one dict per FAISS row. This module stores the same
+metadata as one NumPy array per field, so it can be memory-mapped at load
+time and indexed by FAISS row without any JSON parsing. String fields are
+kept as a UTF-8 byte blob plus an offsets array.
+
+Convert an existing id_map with:
+
+    python -m retriever.id_map_store index/faiss/id_map.jsonl
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+logger = logging.getLogger(__name__)
+
+# SearchResult field -> (id_map key, default)
+STRING_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "snippet": ("text", ""),
+    "law_name": ("law_name", "Unknown"),
+    "law_id": ("law_id", "Unknown"),
+    "section_label": ("section_label", ""),
+    "jurisdiction": ("jurisdiction", "Unknown"),
+    "source_path": ("source_path", ""),
+}
+
+# SearchResult fields read from the id_map "meta" block
+INT_COLUMNS = ("start_line", "end_line")
+
+
+class ColumnarIdMap:
+    """Struct-of-arrays view over id_map metadata."""
+
+    def __init__(
+        self,
+        strings: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        ints: Dict[str, np.ndarray],
+    ):
+        self._strings = strings
+        self._ints = ints
+        self._size = len(ints[INT_COLUMNS[0]])
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "ColumnarIdMap":
+        """Build columns from id_map dicts."""
+        records = list(records)
+
+        strings = {}
+        for column, (key, default) in STRING_COLUMNS.items():
+            # Same defaults as the JSONL path; only a null can't be stored
+            values = (r.get(key, default) for r in records)
+            encoded = [
+                ("" if value is None else str(value)).encode("utf-8")
+                for value in values
+            ]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            lengths = np.fromiter(
+                (len(b) for b in encoded), dtype=np.int64, count=len(encoded)
+            )
+            np.cumsum(lengths, out=offsets[1:])
+            blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            strings[column] = (offsets, blob)
+
+        ints = {
+            column: np.fromiter(
+                (r.get("meta", {}).get(column, 0) for r in records),
+                dtype=np.int64,
+                count=len(records),
+            )
+            for column in INT_COLUMNS
+        }
+
+        return cls(strings, ints)
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "ColumnarIdMap":
+        """Build columns from an id_map.jsonl file."""
+        with open(path, "rb") as f:
+            return cls.from_records(_json.loads(line) for line in f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "ColumnarIdMap":
+        """Load columns saved by save(), memory-mapped by default."""
+        directory = Path(directory)
+        mmap_mode = "r" if mmap else None
+
+        strings = {
+            column: (
+                np.load(directory / f"{column}.offsets.npy", mmap_mode=mmap_mode),
+                np.load(directory / f"{column}.bytes.npy", mmap_mode=mmap_mode),
+            )
+            for column in STRING_COLUMNS
+        }
+        ints = {
+            column: np.load(directory / f"{column}.npy", mmap_mode=mmap_mode)
+            for column in INT_COLUMNS
+        }
+
+        return cls(strings, ints)
+
+    def save(self, directory: str):
+        """Write one .npy file per column array."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for column, (offsets, blob) in self._strings.items():
+            np.save(directory / f"{column}.offsets.npy", offsets)
+            np.save(directory / f"{column}.bytes.npy", blob)
+        for column, values in self._ints.items():
+            np.save(directory / f"{column}.npy", values)
+
+    def get_str(self, column: str, row: int) -> str:
+        """Decode one string cell."""
+        offsets, blob = self._strings[column]
+        return blob[offsets[row] : offsets[row + 1]].tobytes().decode("utf-8")
+
+    def take(self, rows: List[int]) -> Dict[str, List[Any]]:
+        """Return each SearchResult metadata column restricted to rows."""
+        fields = {
+            column: [self.get_str(column, row) for row in rows]
+            for column in STRING_COLUMNS
+        }
+        for column, values in self._ints.items():
+            fields[column] = values[rows].tolist()
+        return fields
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Return SearchResult metadata fields for a FAISS row."""
+        fields = {column: self.get_str(column, row) for column in STRING_COLUMNS}
+        for column, values in self._ints.items():
+            fields[column] = int(values[row])
+        return fields
+
+
+def columns_stale(directory: str, jsonl_path: str) -> bool:
+    """Whether jsonl_path was written after the columns saved in directory."""
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        return False
+
+    saved = [path.stat().st_mtime for path in Path(directory).glob("*.npy")]
+    return not saved or jsonl_path.stat().st_mtime > min(saved)
+
+
+def main():
+    """Convert an id_map.jsonl file to the columnar layout."""
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Convert id_map.jsonl to columns")
+    parser.add_argument("jsonl_path", help="Path to id_map.jsonl")
+    parser.add_argument(
+        "--out",
+        help="Output directory (default: id_map_soa next to the JSONL file)",
+    )
+    args = parser.parse_args()
+
+    out_dir = args.out or str(Path(args.jsonl_path).with_name("id_map_soa"))
+    columns = ColumnarIdMap.from_jsonl(args.jsonl_path)
+    columns.save(out_dir)
+
+    logger.info("Wrote %d rows to %s", len(columns), out_dir)
+
+
+if __name__ == "__main__":
+    main()
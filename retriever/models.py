@@ -7,6 +7,18 @@ from dataclasses import asdict, dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to indented JSON text, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
 
 class Jurisdiction(str, Enum):
     """Supported jurisdictions."""
@@ -17,7 +29,7 @@ class Jurisdiction(str, Enum):
     US = "US"
 
 
-@dataclass
+@dataclass(slots=True)
 class LegalDocument:
     """Represents a legal document with metadata."""
 
@@ -32,7 +44,7 @@ class LegalDocument:
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class TextChunk:
     """Represents a chunk of text with metadata and positioning."""
 
@@ -53,7 +65,7 @@ class TextChunk:
         return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Search result with scoring and metadata."""
 
@@ -74,7 +86,7 @@ class SearchResult:
         return asdict(self)
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
+        return _dumps(self.to_dict())
 
 
 @dataclass
@@ -116,10 +128,10 @@ class RetrievalResponse:
         }
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
+        return _dumps(self.to_dict())
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexStats:
     """Statistics about the vector index."""
 
@@ -0,0 +1,106 @@
+"""
+ONNX Runtime sentence encoder for quantized embedding models.
+
+Produce a quantized export of the embedding model with, for example:
+
+    optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 onnx/
+    optimum-cli onnxruntime quantize --avx512 --onnx_model onnx/ -o onnx/
+
+and point ``embedding.onnx_path`` at the output directory.
+"""
+
+import logging
+from typing import List, Union
+
+import numpy as np
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+except ImportError:
+    ORTModelForFeatureExtraction = None
+    AutoTokenizer = None
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxSentenceEncoder:
+    """Mean-pooled sentence encoder with a SentenceTransformer-style encode()."""
+
+    def __init__(
+        self,
+        model_path: str,
+        file_name: str = "model_quantized.onnx",
+        max_length: int = 256,
+    ):
+        """
+        Load the tokenizer and ONNX session.
+
+        Args:
+            model_path: Directory containing the ONNX export and tokenizer files
+            file_name: ONNX model file inside model_path
+            max_length: Maximum tokens per input
+        """
+        if ORTModelForFeatureExtraction is None:
+            raise ImportError(
+                "optimum[onnxruntime] is required for ONNX encoding. "
+                "Install with: pip install optimum[onnxruntime]"
+            )
+
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_path, file_name=file_name, provider="CPUExecutionProvider"
+        )
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = False,
+    ) -> np.ndarray:
+        """
+        Encode sentences into float32 embeddings.
+
+        Accepts the same keyword arguments as SentenceTransformer.encode so the
+        two are interchangeable; output is always a NumPy array.
+        """
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+
+        # Smart batching: group similar lengths so each batch pads minimally
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        embeddings = None
+
+        for start in range(0, len(order), batch_size):
+            batch_ids = order[start : start + batch_size]
+            inputs = self.tokenizer(
+                [sentences[i] for i in batch_ids],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            token_embeddings = self.model(**inputs).last_hidden_state
+
+            # Mean pooling over non-padding tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+
+            if embeddings is None:
+                embeddings = np.empty(
+                    (len(sentences), pooled.shape[1]), dtype=np.float32
+                )
+            embeddings[batch_ids] = pooled
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.clip(norms, 1e-12, None)
+
+        return embeddings
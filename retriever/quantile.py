@@ -0,0 +1,99 @@
+"""
+Streaming quantile estimation with the P² algorithm.
+
+Jain & Chlamtac, "The P² Algorithm for Dynamic Calculation of Quantiles and
+Histograms Without Storing Observations" (CACM, 1985). Five markers track the
+minimum, the target quantile, the two quantiles halfway to it and the
+maximum; each observation moves them in O(1) time and memory.
+"""
+
+from typing import List
+
+
+class P2Quantile:
+    """Running estimate of one quantile without storing observations."""
+
+    def __init__(self, p: float):
+        """
+        Initialize the estimator.
+
+        Args:
+            p: Quantile to track, between 0 and 1 (e.g. 0.95 for P95)
+        """
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"Quantile must be between 0 and 1: {p}")
+
+        self.p = p
+        self.count = 0
+        # Marker heights, and actual/desired marker positions (0-based)
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float):
+        """Add one observation."""
+        heights = self._heights
+
+        # The first five observations become the initial markers. count is
+        # bumped after the append so it never exceeds len(heights) here.
+        if self.count < 5:
+            heights.append(x)
+            heights.sort()
+            self.count += 1
+            return
+
+        self.count += 1
+
+        # Find the cell containing x, extending the extremes if needed
+        if x < heights[0]:
+            heights[0] = x
+            cell = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            cell = 3
+        else:
+            cell = 0
+            while x >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (
+                offset <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def value(self) -> float:
+        """Current estimate of the quantile (0 before any observation)."""
+        if self.count > 5:
+            return self._heights[2]
+        if not self._heights:
+            return 0.0
+        # Too few observations for the markers: take it from the sorted values
+        return self._heights[min(int(self.count * self.p), self.count - 1)]
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise-parabolic (P²) height prediction for marker i."""
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        """Linear height prediction, used when the parabola overshoots."""
+        q, n = self._heights, self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
@@ -7,28 +7,70 @@ import math
 import re
 import time
 from collections import Counter, defaultdict
+from functools import lru_cache
 from typing import Dict, List, Optional, Set, Tuple
 
-try:
-    import numpy as np
-except ImportError:
-    np = None
+import numpy as np
 
+from retriever import _bm25
 from retriever.models import SearchResult, TextChunk
 
 logger = logging.getLogger(__name__)
 
+# Legal citations, e.g. "§501.1736(2)(a)" -> "section_501.1736(2)(a)"
+_CITATION_RE = re.compile(r"§\s*(\d+[a-z]*(?:[.\-]\d+)*(?:\([^)]+\))*)")
+# Article references, e.g. "Art. 28" -> "article_28"
+_ARTICLE_RE = re.compile(r"art(?:icle)?[.]?\s*(\d+(?:\(\d+\))*)")
+
+# Byte translation table for the tokenizer: [a-z0-9_] map to themselves and
+# every other byte to a space, so bytes.split() yields the tokens
+_TOKEN_BYTES = bytes(
+    c if chr(c) in "abcdefghijklmnopqrstuvwxyz0123456789_" else 0x20 for c in range(256)
+)
+_SENTENCE_END_RE = re.compile(r"[.!?]\s+")
+
+_STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "for",
+        "from",
+        "has",
+        "he",
+        "in",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "that",
+        "the",
+        "to",
+        "was",
+        "will",
+        "with",
+    }
+)
+
 
 class BM25Scorer:
     """BM25 implementation for sparse text retrieval."""
 
-    def __init__(self, k1: float = 1.5, b: float = 0.75):
+    def __init__(self, k1: float = 1.5, b: float = 0.75, use_numba: bool = False):
         """
         Initialize BM25 with hyperparameters.
 
         Args:
             k1: Term frequency saturation parameter
             b: Length normalization parameter
+            use_numba: Score multi-token queries with the Numba kernel in
+                retriever/_bm25.py (ignored when Numba is not installed)
         """
         self.k1 = k1
         self.b = b
@@ -36,20 +78,80 @@ class BM25Scorer:
         self.doc_lengths = []
         self.avg_doc_length = 0.0
         self.corpus_size = 0
-        self.tokenized_docs = []
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.dl_over_avgdl = np.zeros(0, dtype=np.float32)
+
+        # CSR postings shared by all tokens; self.postings holds views of it
+        self._token_rows: Dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._doc_ids = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.float32)
+        self._idfs = np.zeros(0, dtype=np.float32)
+
+        if use_numba and not _bm25.COMPILED:
+            logger.warning("numba is not installed; scoring BM25 with NumPy")
+        self.use_numba = use_numba and _bm25.COMPILED
+
+        # Query strings repeat (evaluation runs, dashboards); tokenize each once
+        self._cached_query_tokens = lru_cache(maxsize=8192)(self._query_tokens)
 
     def fit(self, documents: List[str]):
         """Build BM25 index from document corpus."""
-        self.tokenized_docs = [self._tokenize(doc) for doc in documents]
-        self.doc_lengths = [len(tokens) for tokens in self.tokenized_docs]
+        # Token lists are only needed while building; the postings, document
+        # lengths and frequencies below are all that scoring keeps
+        tokenized_docs = [self._tokenize(doc) for doc in documents]
+        self.doc_lengths = [len(tokens) for tokens in tokenized_docs]
         self.avg_doc_length = sum(self.doc_lengths) / len(self.doc_lengths)
         self.corpus_size = len(documents)
 
-        # Calculate document frequencies
-        for tokens in self.tokenized_docs:
-            unique_tokens = set(tokens)
-            for token in unique_tokens:
-                self.doc_frequencies[token] += 1
+        self.dl_over_avgdl = (
+            np.asarray(self.doc_lengths, dtype=np.float32) / self.avg_doc_length
+        )
+
+        # Inverted index: token -> (doc_ids, term frequencies) arrays
+        postings = defaultdict(list)
+        for doc_idx, tokens in enumerate(tokenized_docs):
+            for token, tf in Counter(tokens).items():
+                postings[token].append((doc_idx, tf))
+        # All postings live in one CSR layout, token by token; each entry
+        # of self.postings is a view of its token's range
+        lengths = np.fromiter(
+            (len(docs) for docs in postings.values()),
+            dtype=np.int64,
+            count=len(postings),
+        )
+        self._offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._offsets[1:])
+        total = int(self._offsets[-1])
+        self._doc_ids = np.fromiter(
+            (d for docs in postings.values() for d, _ in docs),
+            dtype=np.int32,
+            count=total,
+        )
+        self._tfs = np.fromiter(
+            (tf for docs in postings.values() for _, tf in docs),
+            dtype=np.float32,
+            count=total,
+        )
+        self._idfs = np.log(
+            (self.corpus_size - lengths + 0.5) / (lengths + 0.5)
+        ).astype(np.float32)
+        self._token_rows = {token: row for row, token in enumerate(postings)}
+        self.postings = {
+            token: (self._doc_ids[start:end], self._tfs[start:end])
+            for token, start, end in zip(
+                postings, self._offsets[:-1].tolist(), self._offsets[1:].tolist()
+            )
+        }
+
+        # Document frequency is the length of each postings list
+        self.doc_frequencies = defaultdict(
+            int, {token: len(docs) for token, docs in self.postings.items()}
+        )
+
+        if self.use_numba:
+            # Compile the kernel now instead of on the first query
+            self._accumulate(np.zeros(self.corpus_size, dtype=np.float32), ())
 
         logger.info(f"Built BM25 index for {self.corpus_size} documents")
 
@@ -57,6 +159,9 @@ class BM25Scorer:
         """
         Score documents against query.
 
+        Only the postings of the query tokens are visited, so documents that
+        share no token with the query cost nothing.
+
         Args:
             query: Search query
             doc_indices: Specific document indices to score (None for all)
@@ -64,44 +169,95 @@ class BM25Scorer:
         Returns:
             BM25 scores for documents
         """
-        query_tokens = self._tokenize(query)
+        query_tokens = self._cached_query_tokens(query)
 
-        if doc_indices is None:
-            doc_indices = list(range(self.corpus_size))
-
-        scores = []
-
-        for doc_idx in doc_indices:
-            if doc_idx >= len(self.tokenized_docs):
-                scores.append(0.0)
-                continue
-
-            doc_tokens = self.tokenized_docs[doc_idx]
-            doc_length = self.doc_lengths[doc_idx]
+        # Most queries reduce to one token after stop-word removal
+        if len(query_tokens) == 1:
+            return self._score_one(query_tokens[0], doc_indices)
 
-            score = 0.0
-            token_counts = Counter(doc_tokens)
+        scores = np.zeros(self.corpus_size, dtype=np.float32)
 
+        if self.use_numba:
+            self._accumulate(scores, query_tokens)
+        else:
             for token in query_tokens:
-                if token in token_counts:
-                    tf = token_counts[token]
-                    df = self.doc_frequencies[token]
+                postings = self.postings.get(token)
+                if postings is None:
+                    continue
+                doc_ids, tfs = postings
+                # doc_ids are unique within a postings list, so += does not
+                # drop hits
+                scores[doc_ids] += self._term_scores(doc_ids, tfs)
+
+        if doc_indices is None:
+            return scores.tolist()
+
+        doc_indices = np.asarray(doc_indices, dtype=np.int64)
+        in_range = doc_indices < self.corpus_size
+        selected = np.zeros(len(doc_indices), dtype=np.float32)
+        selected[in_range] = scores[doc_indices[in_range]]
+        return selected.tolist()
+
+    def _score_one(
+        self, token: str, doc_indices: Optional[List[int]] = None
+    ) -> List[float]:
+        """Score a single-token query straight from its postings.
+
+        No corpus-sized accumulator is needed when doc_indices is given:
+        postings are sorted by doc id, so each requested document is found
+        with a binary search.
+        """
+        num_docs = self.corpus_size if doc_indices is None else len(doc_indices)
+        selected = np.zeros(num_docs, dtype=np.float32)
 
-                    # IDF component
-                    idf = math.log((self.corpus_size - df + 0.5) / (df + 0.5))
+        postings = self.postings.get(token)
+        if postings is None:
+            return selected.tolist()
+        doc_ids, tfs = postings
+        term_scores = self._term_scores(doc_ids, tfs)
 
-                    # TF component with length normalization
-                    tf_component = (tf * (self.k1 + 1)) / (
-                        tf
-                        + self.k1
-                        * (1 - self.b + self.b * (doc_length / self.avg_doc_length))
-                    )
+        if doc_indices is None:
+            selected[doc_ids] = term_scores
+            return selected.tolist()
+
+        doc_indices = np.asarray(doc_indices, dtype=np.int64)
+        positions = np.searchsorted(doc_ids, doc_indices)
+        found = positions < len(doc_ids)
+        found[found] = doc_ids[positions[found]] == doc_indices[found]
+        selected[found] = term_scores[positions[found]]
+        return selected.tolist()
+
+    def _accumulate(self, scores: np.ndarray, query_tokens: Tuple[str, ...]):
+        """Add the query tokens' BM25 scores to scores with the Numba kernel."""
+        token_rows = np.fromiter(
+            (self._token_rows[t] for t in query_tokens if t in self._token_rows),
+            dtype=np.int64,
+        )
+        _bm25.accumulate_scores(
+            scores,
+            token_rows,
+            self._offsets,
+            self._doc_ids,
+            self._tfs,
+            self._idfs,
+            self.dl_over_avgdl,
+            np.float32(self.k1),
+            np.float32(self.b),
+        )
 
-                    score += idf * tf_component
+    def _term_scores(self, doc_ids: np.ndarray, tfs: np.ndarray) -> np.ndarray:
+        """BM25 contribution of one token to each document in its postings."""
+        # IDF component
+        df = len(doc_ids)
+        idf = math.log((self.corpus_size - df + 0.5) / (df + 0.5))
 
-            scores.append(score)
+        # TF component with length normalization, for every posting at once
+        denom = tfs + self.k1 * (1 - self.b + self.b * self.dl_over_avgdl[doc_ids])
+        return idf * tfs * (self.k1 + 1) / denom
 
-        return scores
+    def _query_tokens(self, query: str) -> Tuple[str, ...]:
+        """Tokenize a query; the tuple result is what the LRU cache stores."""
+        return tuple(self._tokenize(query))
 
     def _tokenize(self, text: str) -> List[str]:
         """Simple tokenization with legal text preprocessing."""
@@ -109,47 +265,20 @@ class BM25Scorer:
         text = text.lower()
 
         # Handle legal citations and section numbers
-        text = re.sub(
-            r"§\\s*(\\d+[a-z]*(?:[.\\-]\\d+)*(?:\\([^)]+\\))*)", r"section_\\1", text
-        )
-        text = re.sub(
-            r"art(?:icle)?[.]?\\s*(\\d+(?:\\(\\d+\\))*)", r"article_\\1", text
-        )
+        text = _CITATION_RE.sub(r"section_\1", text)
+        text = _ARTICLE_RE.sub(r"article_\1", text)
 
-        # Extract alphanumeric tokens
-        tokens = re.findall(r"\\b[a-z0-9_]+\\b", text)
+        # Extract alphanumeric tokens with one byte-table pass; non-ASCII
+        # characters become "?" and so act as separators
+        words = text.encode("ascii", "replace").translate(_TOKEN_BYTES).split()
 
         # Filter out very short tokens and common stop words
-        stop_words = {
-            "a",
-            "an",
-            "and",
-            "are",
-            "as",
-            "at",
-            "be",
-            "by",
-            "for",
-            "from",
-            "has",
-            "he",
-            "in",
-            "is",
-            "it",
-            "its",
-            "of",
-            "on",
-            "that",
-            "the",
-            "to",
-            "was",
-            "will",
-            "with",
-        }
-
-        tokens = [
-            token for token in tokens if len(token) > 2 and token not in stop_words
-        ]
+        tokens = []
+        for word in words:
+            if len(word) > 2:
+                token = word.decode("ascii")
+                if token not in _STOP_WORDS:
+                    tokens.append(token)
 
         return tokens
 
@@ -161,8 +290,15 @@ class QueryExpander:
         """Initialize with expansion term mappings."""
         self.expansion_terms = expansion_terms
 
+        # Expansions depend only on the query and the fixed term mappings
+        self._cached_expand = lru_cache(maxsize=4096)(self._expand_query)
+
     def expand_query(self, query: str) -> str:
         """Expand query with related legal terms."""
+        return self._cached_expand(query)
+
+    def _expand_query(self, query: str) -> str:
+        """Expand a query without consulting the cache."""
         expanded_terms = [query]
         query_lower = query.lower()
 
@@ -189,6 +325,9 @@ class HybridRetriever:
         bm25_weight: float = 0.3,
         dense_weight: float = 0.7,
         expansion_terms: Optional[Dict[str, List[str]]] = None,
+        fusion: str = "linear",
+        rrf_k: int = 60,
+        use_numba: bool = False,
     ):
         """
         Initialize hybrid retriever.
@@ -197,12 +336,22 @@ class HybridRetriever:
             bm25_weight: Weight for BM25 scores
             dense_weight: Weight for dense vector scores
             expansion_terms: Query expansion mappings
+            fusion: "linear" (weighted min-max scores) or "rrf" (Reciprocal
+                Rank Fusion, which ignores the weights)
+            rrf_k: RRF rank offset
+            use_numba: Score BM25 with the Numba kernel when it is installed
         """
+        if fusion not in ("linear", "rrf"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+
         self.bm25_weight = bm25_weight
         self.dense_weight = dense_weight
-        self.bm25 = BM25Scorer()
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self.bm25 = BM25Scorer(use_numba=use_numba)
         self.expander = QueryExpander(expansion_terms or {})
         self.chunks = []
+        self._by_law: Dict[str, np.ndarray] = {}
 
         # Validate weights
         if abs(bm25_weight + dense_weight - 1.0) > 1e-6:
@@ -213,8 +362,26 @@ class HybridRetriever:
         self.chunks = chunks
         documents = [chunk.content for chunk in chunks]
         self.bm25.fit(documents)
+
+        # Chunk indices per law, so law filters don't rescan every chunk
+        by_law = defaultdict(list)
+        for i, chunk in enumerate(chunks):
+            by_law[chunk.law_id].append(i)
+        self._by_law = {
+            law_id: np.asarray(indices, dtype=np.int32)
+            for law_id, indices in by_law.items()
+        }
         logger.info(f"Fitted hybrid retriever with {len(chunks)} chunks")
 
+    def law_indices(self, law_filter: Set[str]) -> np.ndarray:
+        """Ascending chunk indices of the given laws (unknown law_ids match none)."""
+        law_indices = [
+            self._by_law[law_id] for law_id in law_filter if law_id in self._by_law
+        ]
+        if not law_indices:
+            return np.zeros(0, dtype=np.int32)
+        return np.sort(np.concatenate(law_indices))
+
     def retrieve(
         self,
         query: str,
@@ -244,58 +411,72 @@ class HybridRetriever:
 
         # Filter chunks by law if specified
         if law_filter:
-            candidate_indices = [
-                i for i, chunk in enumerate(self.chunks) if chunk.law_id in law_filter
-            ]
+            candidate_indices = self.law_indices(law_filter).tolist()
         else:
             candidate_indices = list(range(len(self.chunks)))
 
         # Get BM25 scores for candidate chunks
         bm25_scores = self.bm25.score(expanded_query, candidate_indices)
 
-        # Combine scores using weighted fusion
-        combined_results = []
-
-        for i, chunk_idx in enumerate(candidate_indices):
-            chunk = self.chunks[chunk_idx]
-
-            # Get individual scores
-            bm25_score = bm25_scores[i] if i < len(bm25_scores) else 0.0
-            dense_score = dense_score_dict.get(chunk_idx, 0.0)
-
-            # Normalize scores (simple min-max scaling)
-            normalized_bm25 = self._normalize_score(
-                bm25_score, [s for s in bm25_scores if s > 0]
+        # Candidate positions of the dense hits, which arrive in rank order.
+        # candidate_indices is ascending, so positions come from a binary search.
+        candidates = np.asarray(candidate_indices, dtype=np.int64)
+        dense_ids = np.fromiter(dense_score_dict, dtype=np.int64)
+        positions = np.searchsorted(candidates, dense_ids)
+        found = positions < len(candidates)
+        found[found] = candidates[positions[found]] == dense_ids[found]
+        dense_positions = positions[found]
+
+        if self.fusion == "rrf":
+            combined = self._rrf_scores(
+                bm25_scores,
+                dense_positions,
+                np.flatnonzero(found),
+                window=max(top_k, len(dense_score_dict)),
             )
-            normalized_dense = dense_score  # Already normalized by FAISS
+        else:
+            # Normalize scores (simple min-max scaling), once for all
+            # candidates. Fusion only feeds a top-k ranking, so half
+            # precision is plenty.
+            normalized_bm25 = self._normalize_scores(bm25_scores).astype(np.float16)
+
+            # Dense scores are already normalized by FAISS
+            dense_values = np.fromiter(dense_score_dict.values(), dtype=np.float16)
+            dense = np.zeros(len(candidates), dtype=np.float16)
+            dense[dense_positions] = dense_values[found]
 
             # Weighted combination
-            combined_score = (
-                self.bm25_weight * normalized_bm25
-                + self.dense_weight * normalized_dense
-            )
+            combined = self.bm25_weight * normalized_bm25 + self.dense_weight * dense
 
-            result = SearchResult(
-                law_id=chunk.law_id,
-                law_name=chunk.law_name,
-                jurisdiction=chunk.jurisdiction,
-                section_label=chunk.section_label,
-                score=combined_score,
-                snippet=self._create_snippet(chunk.content),
-                start_line=chunk.start_line,
-                end_line=chunk.end_line,
-                source_path=chunk.source_path,
-                latency_ms=0,  # Will be set later
-                dense_score=dense_score,
-                sparse_score=bm25_score,
+        # Select top_k in O(N), then order only those (ties keep corpus order)
+        k = min(top_k, len(combined))
+        if k < len(combined):
+            top = np.argpartition(-combined, k - 1)[:k]
+        else:
+            top = np.arange(len(combined))
+        top = top[np.lexsort((top, -combined[top]))]
+
+        # Build SearchResult objects for the selected candidates only
+        top_results = []
+        for i in top.tolist():
+            chunk = self.chunks[candidate_indices[i]]
+            top_results.append(
+                SearchResult(
+                    law_id=chunk.law_id,
+                    law_name=chunk.law_name,
+                    jurisdiction=chunk.jurisdiction,
+                    section_label=chunk.section_label,
+                    score=float(combined[i]),
+                    snippet=self._create_snippet(chunk.content),
+                    start_line=chunk.start_line,
+                    end_line=chunk.end_line,
+                    source_path=chunk.source_path,
+                    latency_ms=0,  # Will be set later
+                    dense_score=dense_score_dict.get(candidate_indices[i], 0.0),
+                    sparse_score=bm25_scores[i],
+                )
             )
 
-            combined_results.append(result)
-
-        # Sort by combined score and take top_k
-        combined_results.sort(key=lambda x: x.score, reverse=True)
-        top_results = combined_results[:top_k]
-
         # Set latency for all results
         latency_ms = int((time.time() - start_time) * 1000)
         for result in top_results:
@@ -303,18 +484,57 @@ class HybridRetriever:
 
         return top_results
 
-    def _normalize_score(self, score: float, score_list: List[float]) -> float:
-        """Normalize score using min-max scaling."""
-        if not score_list or len(score_list) == 1:
-            return 1.0 if score > 0 else 0.0
+    def _rrf_scores(
+        self,
+        bm25_scores: List[float],
+        dense_positions: np.ndarray,
+        dense_ranks: np.ndarray,
+        window: int,
+    ) -> np.ndarray:
+        """
+        Reciprocal Rank Fusion: sum of 1 / (rrf_k + rank) over both rankings.
+
+        Only ranks matter, so no normalization pass is needed. BM25 ranks are
+        taken for the top window matching candidates; candidates outside a
+        ranking contribute nothing for it.
+
+        Args:
+            bm25_scores: BM25 score per candidate
+            dense_positions: Candidate positions of the dense hits
+            dense_ranks: 0-based dense rank of each of those hits
+            window: Number of BM25 ranks to consider
+
+        Returns:
+            Fused score per candidate
+        """
+        bm25 = np.asarray(bm25_scores, dtype=np.float32)
+        fused = np.zeros(len(bm25), dtype=np.float32)
+        fused[dense_positions] = 1.0 / (self.rrf_k + 1 + dense_ranks)
+
+        n = min(window, int(np.count_nonzero(bm25 > 0)))
+        if n:
+            top = np.argpartition(-bm25, n - 1)[:n]
+            top = top[np.lexsort((top, -bm25[top]))]
+            fused[top] += 1.0 / (self.rrf_k + 1 + np.arange(n))
+
+        return fused
+
+    def _normalize_scores(self, scores: List[float]) -> np.ndarray:
+        """Min-max scale positive scores in one pass; others map to 0."""
+        scores = np.asarray(scores, dtype=np.float32)
+        positive = scores > 0
+        if not positive.any():
+            return np.zeros_like(scores)
 
-        min_score = min(score_list)
-        max_score = max(score_list)
+        min_score = scores[positive].min()
+        max_score = scores[positive].max()
 
         if max_score == min_score:
-            return 1.0 if score > 0 else 0.0
+            return positive.astype(np.float32)
 
-        return (score - min_score) / (max_score - min_score)
+        return np.where(
+            positive, (scores - min_score) / (max_score - min_score), 0.0
+        ).astype(np.float32)
 
     def _create_snippet(self, content: str, max_chars: int = 1200) -> str:
         """Create snippet from content with proper boundaries."""
@@ -322,7 +542,7 @@ class HybridRetriever:
             return content
 
         # Try to break at sentence boundaries
-        sentences = re.split(r"[.!?]\\s+", content[: max_chars + 100])
+        sentences = _SENTENCE_END_RE.split(content[: max_chars + 100])
 
         snippet = ""
         for sentence in sentences[:-1]:  # Exclude last partial sentence
@@ -2,17 +2,20 @@
 FastAPI service for regulation retrieval with caching and performance monitoring.
 """
 
-import hashlib
 import logging
 import os
+import re
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from functools import lru_cache
-from typing import List, Optional, Set
+from typing import Any, List, Optional, Set, Tuple
 
 try:
     from contextlib import asynccontextmanager
 
+    import anyio.to_thread
     from fastapi import FastAPI, HTTPException, Query
     from fastapi.middleware.cors import CORSMiddleware
     from pydantic import BaseModel, Field
@@ -24,11 +27,17 @@ try:
 except ImportError:
     np = None
 
+import faiss
+import orjson
+import pandas as pd
 from fastapi import Query
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
 from index.build_index import VectorIndexBuilder
+from retriever import _snippet
+from retriever.embedding_batcher import EmbeddingBatcher
 from retriever.models import RetrievalRequest, RetrievalResponse, SearchResult
+from retriever.quantile import P2Quantile
 from retriever.rank import HybridRetriever
 from src.evidence import EvidenceExporter
 
@@ -47,6 +56,17 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Maximum cached retrieval responses
+_CACHE_SIZE = 500
+
+# Sentence end followed by a space, for snippet truncation
+_SENTENCE_BOUNDARY_RE = re.compile(r"[.!?] ")
+
+
+def _serialize_response(response: RetrievalResponse) -> bytes:
+    """Serialize a response to JSON bytes."""
+    return orjson.dumps(response, option=orjson.OPT_SERIALIZE_NUMPY)
+
 
 class RetrievalService:
     """High-performance regulation retrieval service."""
@@ -64,8 +84,19 @@ class RetrievalService:
         # Initialize components
         self.index_builder = VectorIndexBuilder(config_path)
         self.hybrid_retriever = None
+        self.embedding_batcher = None
         self.is_ready = False
 
+        # LRU of (response, serialized JSON) keyed by the request tuple and
+        # the index version, which _load_index bumps on every (re)load
+        self._index_version = 0
+        self._response_cache: "OrderedDict[tuple, Tuple[RetrievalResponse, bytes]]" = (
+            OrderedDict()
+        )
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
         # Initialize MCP orchestrator if available
         self.mcp_orchestrator = None
         if MCP_AVAILABLE:
@@ -81,7 +112,11 @@ class RetrievalService:
         # Performance monitoring
         self.query_count = 0
         self.total_latency = 0.0
-        self.latencies = []
+
+        # Streaming P50/P95 estimates: O(1) per request and per health check
+        self._p50 = P2Quantile(0.5)
+        self._p95 = P2Quantile(0.95)
+        self._metrics_lock = threading.Lock()
 
     def _load_index(self, index_dir: str):
         """Load vector index and initialize retriever."""
@@ -96,29 +131,95 @@ class RetrievalService:
             bm25_weight=self.retrieval_config["bm25_weight"],
             dense_weight=self.retrieval_config["dense_weight"],
             expansion_terms=expansion_terms,
+            fusion=self.retrieval_config.get("fusion", "linear"),
+            rrf_k=self.retrieval_config.get("rrf_k", 60),
+            use_numba=self.performance_config.get("numba_bm25", False),
         )
 
         # Fit retriever with chunks
         self.hybrid_retriever.fit(self.index_builder.chunks_metadata)
 
+        # Half-precision query encoding on GPU halves the transformer's memory
+        # traffic; the batcher hands FAISS float32 rows either way
+        model = self.index_builder.model
+        on_gpu = str(model.device).startswith("cuda")
+        if self.performance_config.get("fp16") and on_gpu:
+            model.half()
+            logger.info("Encoding queries in fp16")
+
+        # On GPU, search a device copy of the vectors so query embeddings stay
+        # on the device instead of crossing PCIe twice per query
+        keep_on_device = on_gpu and self.index_builder.to_device(
+            model.device, dtype=next(model.parameters()).dtype
+        )
+
+        # Concurrent requests share one query-encoding forward pass and one
+        # dense index search over the stacked embeddings
+        self.dense_top_k = self.retrieval_config["max_results"]
+        self.embedding_batcher = EmbeddingBatcher(
+            self.index_builder.model,
+            max_batch_size=self.performance_config.get("embedding_batch_size", 32),
+            max_wait_ms=self.performance_config.get("embedding_batch_wait_ms", 2.0),
+            search_fn=lambda embeddings: self.index_builder.search_indices_batch(
+                embeddings, top_k=self.dense_top_k, normalized=True
+            ),
+            normalize_embeddings=True,
+            convert_to_tensor=keep_on_device,
+        )
+
+        # Responses built from the previous index must not be served again
+        with self._cache_lock:
+            self._index_version += 1
+            self._response_cache.clear()
+
         self.is_ready = True
         logger.info("Retrieval service ready")
 
-    @lru_cache(maxsize=500)
     def _cached_retrieve(
         self, query: str, laws_tuple: Optional[tuple], top_k: int, max_chars: int
-    ) -> str:
-        """Cached retrieval with tuple-based caching."""
+    ) -> Tuple[RetrievalResponse, bytes]:
+        """Cached retrieval keyed by the request tuple.
+
+        The cache is a per-instance LRU, so it never outlives the service the
+        way a class-level lru_cache on a method would. The key includes the
+        index version, so a response computed against a replaced index is
+        never returned after a reload. The response object
+        and its JSON serialization are cached together, so a hit costs
+        nothing beyond the lookup and each response is serialized once.
+        Callers must treat the response as read-only.
+        """
+        key = (query, laws_tuple, top_k, max_chars, self._index_version)
+
+        with self._cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None:
+                self._response_cache.move_to_end(key)
+                self._cache_hits += 1
+                return entry
+            self._cache_misses += 1
+
+        response = self._build_response(query, laws_tuple, top_k, max_chars)
+        entry = (response, _serialize_response(response))
+
+        with self._cache_lock:
+            self._response_cache[key] = entry
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > _CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+        return entry
+
+    def _build_response(
+        self, query: str, laws_tuple: Optional[tuple], top_k: int, max_chars: int
+    ) -> RetrievalResponse:
+        """Run retrieval and wrap the results in a response."""
         # Convert tuple back to set for filtering
         law_filter = set(laws_tuple) if laws_tuple else None
 
         # Perform retrieval
         results = self._retrieve_internal(query, law_filter, top_k, max_chars)
 
-        # Serialize results for caching
-        import json
-
-        response = RetrievalResponse(
+        return RetrievalResponse(
             query=query,
             results=results,
             total_latency_ms=results[0].latency_ms if results else 0,
@@ -126,8 +227,6 @@ class RetrievalService:
             total_chunks_searched=len(self.index_builder.chunks_metadata),
         )
 
-        return response.to_json()
-
     def retrieve(self, request: RetrievalRequest) -> RetrievalResponse:
         """
         Main retrieval endpoint with caching and performance monitoring.
@@ -136,37 +235,48 @@ class RetrievalService:
             request: Validated retrieval request
 
         Returns:
-            Retrieval response with ranked results
+            Retrieval response with ranked results. Repeat requests get the
+            same cached object, so callers must not mutate it.
         """
+        return self._retrieve_entry(request)[0]
+
+    def retrieve_json(self, request: RetrievalRequest) -> bytes:
+        """
+        Retrieve, returning the response already serialized as JSON bytes.
+
+        Args:
+            request: Validated retrieval request
+
+        Returns:
+            JSON body of the retrieval response
+        """
+        return self._retrieve_entry(request)[1]
+
+    def _retrieve_entry(
+        self, request: RetrievalRequest
+    ) -> Tuple[RetrievalResponse, bytes]:
+        """Retrieve a (response, JSON bytes) pair, recording metrics."""
         if not self.is_ready:
             raise RuntimeError("Service not ready. Index not loaded.")
 
         start_time = time.time()
 
-        # Convert laws list to tuple for caching
-        laws_tuple = tuple(sorted(request.laws)) if request.laws else None
+        # Convert laws list to an order-independent tuple for the cache key;
+        # nothing to sort for the common no-filter and single-law requests
+        laws = request.laws
+        if not laws:
+            laws_tuple = None
+        elif len(laws) == 1:
+            laws_tuple = (laws[0],)
+        else:
+            laws_tuple = tuple(sorted(laws))
 
         # Use cached retrieval
         try:
-            cached_result = self._cached_retrieve(
+            response, body = self._cached_retrieve(
                 request.query, laws_tuple, request.top_k, request.max_chars
             )
 
-            # Deserialize cached result
-            import json
-
-            result_dict = json.loads(cached_result)
-
-            # Reconstruct response
-            results = [SearchResult(**r) for r in result_dict["results"]]
-            response = RetrievalResponse(
-                query=result_dict["query"],
-                results=results,
-                total_latency_ms=result_dict["total_latency_ms"],
-                laws_searched=result_dict["laws_searched"],
-                total_chunks_searched=result_dict["total_chunks_searched"],
-            )
-
         except Exception as e:
             logger.error(f"Retrieval failed: {e}")
             # Return empty response
@@ -177,32 +287,33 @@ class RetrievalService:
                 laws_searched=request.laws or [],
                 total_chunks_searched=0,
             )
+            body = _serialize_response(response)
 
         # Update performance metrics
         self._update_metrics(response.total_latency_ms)
 
-        return response
+        return response, body
 
     def _retrieve_internal(
         self, query: str, law_filter: Optional[Set[str]], top_k: int, max_chars: int
     ) -> List[SearchResult]:
         """Internal retrieval logic without caching."""
-        # Generate query embedding
-        query_embedding = self.index_builder.model.encode(
-            [query], convert_to_numpy=True
-        )
-
-        # Get dense vector results
-        dense_results = self.index_builder.search(
-            query_embedding[0], top_k=self.retrieval_config["max_results"]
-        )
-
-        # Convert to (score, index) format
-        dense_scores = [
-            (score, i)
-            for i, (score, chunk) in enumerate(dense_results)
-            if chunk in self.index_builder.chunks_metadata
-        ]
+        # Dense (score, chunk index) results, indexed like the fitted chunks.
+        # The query is embedded unit-length and searched together with any
+        # concurrent requests; stored vectors are unit length, so inner
+        # product == cosine.
+        if law_filter:
+            # Search only the filtered laws' chunks, so every dense candidate
+            # survives the filter and no other rows are scored
+            query_embedding = self.embedding_batcher.encode(query, search=False)
+            dense_scores = self.index_builder.search_indices_subset(
+                query_embedding,
+                self.hybrid_retriever.law_indices(law_filter),
+                top_k=self.dense_top_k,
+                normalized=True,
+            )
+        else:
+            dense_scores = self.embedding_batcher.encode(query)
 
         # Use hybrid retrieval for final ranking
         results = self.hybrid_retriever.retrieve(
@@ -216,19 +327,38 @@ class RetrievalService:
 
         return results
 
-    def _truncate_snippet(self, snippet: str, max_chars: int) -> str:
-        """Truncate snippet to max_chars with smart boundary detection."""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _truncate_snippet(snippet: str, max_chars: int) -> str:
+        """Truncate snippet to max_chars with smart boundary detection.
+
+        The result depends only on the arguments and popular chunks come back
+        across queries, so truncations are memoized. Keying on the text rather
+        than a chunk position means an index reload needs no invalidation.
+        """
         if len(snippet) <= max_chars:
             return snippet
 
+        # ASCII text (the usual case for these corpora) has one byte per
+        # character, so the compiled kernel can scan the encoded bytes
+        if _snippet.COMPILED and snippet.isascii():
+            text = np.frombuffer(snippet.encode("ascii"), dtype=np.uint8)
+            kind, index = _snippet.truncation_point(text, max_chars)
+            if kind == _snippet.CUT_SENTENCE:
+                return snippet[: index + 1]
+            return snippet[:index] + "..."
+
         truncated = snippet[:max_chars]
 
-        # Find last sentence boundary
-        last_sentence = max(
-            truncated.rfind(". "), truncated.rfind("! "), truncated.rfind("? ")
-        )
+        # Find the last sentence boundary in one pass, only scanning the
+        # last 30% where a boundary would be accepted
+        last_sentence = -1
+        for match in _SENTENCE_BOUNDARY_RE.finditer(
+            truncated, int(max_chars * 0.7) + 1
+        ):
+            last_sentence = match.start()
 
-        if last_sentence > max_chars * 0.7:
+        if last_sentence >= 0:
             return truncated[: last_sentence + 1]
 
         # Find last word boundary
@@ -240,52 +370,122 @@ class RetrievalService:
 
     def _update_metrics(self, latency_ms: int):
         """Update performance metrics."""
-        self.query_count += 1
-        self.total_latency += latency_ms
-        self.latencies.append(latency_ms)
-
-        # Keep only recent latencies for P95 calculation
-        if len(self.latencies) > 1000:
-            self.latencies = self.latencies[-1000:]
+        # Requests finish on several threadpool threads at once
+        with self._metrics_lock:
+            self.query_count += 1
+            self.total_latency += latency_ms
+            self._p50.update(latency_ms)
+            self._p95.update(latency_ms)
+
+    def _cache_info(self) -> dict:
+        """Response cache statistics in functools.lru_cache's format."""
+        with self._cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "maxsize": _CACHE_SIZE,
+                "currsize": len(self._response_cache),
+            }
 
     def get_health_status(self) -> dict:
         """Get service health and performance metrics."""
-        if not self.latencies:
+        # Read one consistent snapshot; threadpool requests update the
+        # sketches concurrently
+        with self._metrics_lock:
+            query_count = self.query_count
+            total_latency = self.total_latency
+            p50_ms = self._p50.value()
+            p95_ms = self._p95.value()
+
+        if not query_count:
             return {
                 "status": "ready" if self.is_ready else "not_ready",
-                "query_count": self.query_count,
+                "query_count": query_count,
                 "avg_latency_ms": 0,
                 "p95_latency_ms": 0,
-                "cache_info": dict(self._cached_retrieve.cache_info()._asdict()),
+                "cache_info": self._cache_info(),
             }
 
-        # Calculate percentiles
-        sorted_latencies = sorted(self.latencies)
-        p50_idx = int(len(sorted_latencies) * 0.5)
-        p95_idx = int(len(sorted_latencies) * 0.95)
-
         return {
             "status": "ready" if self.is_ready else "not_ready",
-            "query_count": self.query_count,
-            "avg_latency_ms": self.total_latency / self.query_count,
-            "p50_latency_ms": sorted_latencies[p50_idx],
-            "p95_latency_ms": sorted_latencies[p95_idx],
-            "cache_info": dict(self._cached_retrieve.cache_info()._asdict()),
+            "query_count": query_count,
+            "avg_latency_ms": total_latency / query_count,
+            "p50_latency_ms": int(p50_ms),
+            "p95_latency_ms": int(p95_ms),
+            "cache_info": self._cache_info(),
             "total_chunks": (
                 len(self.index_builder.chunks_metadata) if self.is_ready else 0
             ),
         }
 
 
+# Fixed CORS preflight response headers, matching the CORSMiddleware settings
+# below (any origin, method and header, with credentials)
+_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"access-control-max-age", b"600"),
+    (b"vary", b"Origin"),
+]
+
+
+class PreflightMiddleware:
+    """ASGI middleware answering CORS preflights before the app stack runs.
+
+    Wildcard preflights always get the same answer, so they are sent straight
+    from pre-encoded headers, echoing only the request's origin and headers.
+    Every other request, including actual CORS requests, passes through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "OPTIONS":
+            request_headers = dict(scope["headers"])
+            origin = request_headers.get(b"origin")
+            if origin and b"access-control-request-method" in request_headers:
+                headers = _PREFLIGHT_HEADERS + [
+                    (b"access-control-allow-origin", origin)
+                ]
+                requested = request_headers.get(b"access-control-request-headers")
+                if requested:
+                    headers.append((b"access-control-allow-headers", requested))
+
+                await send(
+                    {"type": "http.response.start", "status": 204, "headers": headers}
+                )
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        await self.app(scope, receive, send)
+
+
 # FastAPI app setup
 if FastAPI is not None:
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         """Lifespan context manager for FastAPI app."""
-        global service
+        global service, evidence_exporter
         try:
             service = RetrievalService()
+            evidence_exporter = EvidenceExporter()
+
+            # Sync endpoints run in anyio's worker threads; size the pool so
+            # concurrent retrievals overlap in GIL-releasing NumPy/torch code
+            limiter = anyio.to_thread.current_default_thread_limiter()
+            limiter.total_tokens = service.performance_config.get(
+                "worker_threads", min(32, (os.cpu_count() or 1) * 2)
+            )
+
+            # FAISS's OpenMP thread count is process-wide, so it is set once
+            # here rather than by each index or retriever. This also overrides
+            # any OMP_NUM_THREADS=1 inherited from the environment.
+            faiss.omp_set_num_threads(
+                service.performance_config.get("faiss_threads") or os.cpu_count() or 1
+            )
+
             logger.info("Retrieval service started successfully")
             yield
         except Exception as e:
@@ -299,6 +499,7 @@ if FastAPI is not None:
         description="High-performance legal document retrieval service",
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
@@ -308,10 +509,15 @@ if FastAPI is not None:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # Added last so it runs first
+    app.add_middleware(PreflightMiddleware)
 
     # Global service instance
     service = None
 
+    # Shared by the evidence endpoints so its record cache persists
+    evidence_exporter = None
+
     class RetrievalRequestAPI(BaseModel):
         """API request model."""
 
@@ -331,9 +537,13 @@ if FastAPI is not None:
 
         return service.get_health_status()
 
-    @app.post("/retrieve", response_model=dict)
-    async def retrieve_endpoint(request: RetrievalRequestAPI):
-        """Main retrieval endpoint."""
+    @app.post("/retrieve")
+    def retrieve_endpoint(request: RetrievalRequestAPI):
+        """Main retrieval endpoint.
+
+        Retrieval is blocking CPU work, so this is a sync endpoint that FastAPI
+        runs in its threadpool instead of on the event loop.
+        """
         if service is None:
             raise HTTPException(status_code=503, detail="Service not initialized")
 
@@ -347,8 +557,11 @@ if FastAPI is not None:
                 include_citation=request.include_citation,
             )
 
-            response = service.retrieve(internal_request)
-            return response.to_dict()
+            # Cached responses carry their JSON body, serialized once
+            return Response(
+                content=service.retrieve_json(internal_request),
+                media_type="application/json",
+            )
 
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -356,8 +569,11 @@ if FastAPI is not None:
             logger.error(f"Retrieval error: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
+    # The evidence endpoints read and write log files synchronously, so like
+    # /retrieve they are sync endpoints that FastAPI runs in its threadpool
+
     @app.get("/evidence/export")
-    async def export_evidence(
+    def export_evidence(
         start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
         end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
         agents: Optional[List[str]] = Query(None, description="Filter by agent names"),
@@ -376,29 +592,12 @@ if FastAPI is not None:
             if end_date:
                 parsed_end = datetime.strptime(end_date, "%Y-%m-%d")
 
-            # Initialize exporter
-            exporter = EvidenceExporter()
+            exporter = evidence_exporter
 
             if format == "csv":
-                # Generate temporary CSV file
-                import tempfile
-
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".csv", delete=False
-                ) as tmp_file:
-                    count = exporter.export_to_csv(
-                        tmp_file.name, parsed_start, parsed_end, agents, limit
-                    )
-
-                    # Read file content
-                    with open(tmp_file.name, "r") as f:
-                        csv_content = f.read()
-
-                    # Clean up
-                    os.unlink(tmp_file.name)
-
-                return Response(
-                    content=csv_content,
+                # Stream the CSV straight from the exporter; nothing hits disk
+                return StreamingResponse(
+                    exporter.iter_csv(parsed_start, parsed_end, agents, limit),
                     media_type="text/csv",
                     headers={
                         "Content-Disposition": f"attachment; filename=evidence_export_{datetime.now().strftime('%Y%m%d')}.csv"
@@ -414,7 +613,7 @@ if FastAPI is not None:
             raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
     @app.get("/evidence/summary")
-    async def evidence_summary(
+    def evidence_summary(
         start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
         end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
         agents: Optional[List[str]] = Query(None, description="Filter by agent names"),
@@ -429,8 +628,7 @@ if FastAPI is not None:
             if end_date:
                 parsed_end = datetime.strptime(end_date, "%Y-%m-%d")
 
-            # Initialize exporter
-            exporter = EvidenceExporter()
+            exporter = evidence_exporter
             summary = exporter.get_export_summary(parsed_start, parsed_end, agents)
             return summary
 
@@ -439,7 +637,7 @@ if FastAPI is not None:
             raise HTTPException(status_code=500, detail=f"Summary failed: {str(e)}")
 
     @app.get("/evidence")
-    async def get_evidence(
+    def get_evidence(
         since: Optional[str] = Query(None, description="Start date (ISO8601)"),
         until: Optional[str] = Query(None, description="End date (ISO8601)"),
         agent: Optional[str] = Query(None, description="Filter by agent name"),
@@ -463,98 +661,101 @@ if FastAPI is not None:
             if until:
                 parsed_until = datetime.fromisoformat(until)
 
-            # Initialize exporter
-            exporter = EvidenceExporter()
+            exporter = evidence_exporter
 
             # Get all records for filtering
-            all_records = list(
-                exporter.read_evidence_records(
-                    start_date=parsed_since,
-                    end_date=parsed_until,
-                    agent_filter=[agent] if agent else None,
-                )
+            all_records = exporter.load_evidence_records(
+                start_date=parsed_since,
+                end_date=parsed_until,
+                agent_filter=[agent] if agent else None,
             )
 
+            # One frame over all records; filters, ordering and aggregates
+            # run as column operations. Rows keep their position in
+            # all_records, so returned items are the original dicts.
+            df = pd.DataFrame.from_records(all_records)
+
+            def column(name: str, default: Any = None) -> pd.Series:
+                if name in df:
+                    return df[name].where(df[name].notna(), default)
+                return pd.Series(default, index=df.index, dtype=object)
+
             # Apply additional filters
-            filtered_records = []
-            for record in all_records:
-                # Feature ID filter
-                if feature_id and record.get("feature_id") != feature_id:
-                    continue
-
-                # Dataset tag filter
-                if dataset_tag and record.get("dataset_tag") != dataset_tag:
-                    continue
-
-                # Decision flag filter
-                if (
-                    decision_flag is not None
-                    and record.get("decision_flag") != decision_flag
-                ):
-                    continue
-
-                # Text search filter
-                if q:
-                    search_text = f"{record.get('feature_title', '')} {record.get('reasoning_text', '')}".lower()
-                    if q.lower() not in search_text:
-                        continue
-
-                filtered_records.append(record)
-
-            # Sort records
-            if order == "timestamp_desc":
-                filtered_records.sort(
-                    key=lambda x: x.get("timestamp_iso", ""), reverse=True
-                )
-            elif order == "timestamp_asc":
-                filtered_records.sort(key=lambda x: x.get("timestamp_iso", ""))
-            elif order == "agent_name":
-                filtered_records.sort(key=lambda x: x.get("agent_name", ""))
+            mask = pd.Series(True, index=df.index)
+            if feature_id:
+                mask &= column("feature_id") == feature_id
+            if dataset_tag:
+                mask &= column("dataset_tag") == dataset_tag
+            if decision_flag is not None:
+                mask &= column("decision_flag") == decision_flag
+            if q:
+                search_text = (
+                    column("feature_title", "").astype(str)
+                    + " "
+                    + column("reasoning_text", "").astype(str)
+                ).str.lower()
+                mask &= search_text.str.contains(q.lower(), regex=False)
+            filtered = df[mask]
+
+            # Sort records (stable, so ties keep file order)
+            sort_columns = {
+                "timestamp_desc": ("timestamp_iso", False),
+                "timestamp_asc": ("timestamp_iso", True),
+                "agent_name": ("agent_name", True),
+            }
+            if order in sort_columns and len(filtered):
+                name, ascending = sort_columns[order]
+                keys = column(name, "")[filtered.index].astype(str)
+                filtered = filtered.loc[
+                    keys.sort_values(ascending=ascending, kind="stable").index
+                ]
 
             # Apply pagination
-            total_records = len(filtered_records)
-            paginated_records = filtered_records[offset : offset + limit]
+            total_records = len(filtered)
+            paginated_records = [
+                all_records[i] for i in filtered.index[offset : offset + limit]
+            ]
 
             # Calculate aggregates
-            count_by_decision_flag = {"true": 0, "false": 0}
-            count_by_agent = {}
-            count_by_regulation = {}
-            total_ms_values = []
-
-            for record in filtered_records:
-                # Decision flag counts
-                decision = record.get("decision_flag", False)
-                count_by_decision_flag["true" if decision else "false"] += 1
-
-                # Agent counts
-                agent_name = record.get("agent_name", "unknown")
-                count_by_agent[agent_name] = count_by_agent.get(agent_name, 0) + 1
-
-                # Regulation counts
-                regulations = record.get("related_regulations", [])
-                if isinstance(regulations, list):
-                    for reg in regulations:
-                        count_by_regulation[reg] = count_by_regulation.get(reg, 0) + 1
-
-                # Timing values
-                timings = record.get("timings_ms", {})
-                if isinstance(timings, dict) and "total_ms" in timings:
-                    total_ms_values.append(timings["total_ms"])
-
-            # Calculate percentiles
+            decisions = column("decision_flag", False)[filtered.index].astype(bool)
+            true_count = int(decisions.sum())
+            count_by_decision_flag = {
+                "true": true_count,
+                "false": total_records - true_count,
+            }
+
+            count_by_agent = (
+                column("agent_name", "unknown")[filtered.index]
+                .value_counts(sort=False)
+                .to_dict()
+            )
+
+            # Top regulations
+            regulations = (
+                column("related_regulations")[filtered.index]
+                .map(lambda regs: regs if isinstance(regs, list) else [])
+                .explode()
+                .dropna()
+            )
+            top_regulations = (
+                regulations.value_counts(sort=False)
+                .sort_values(ascending=False, kind="stable")
+                .head(10)
+            )
+
+            # Calculate percentiles. Collected as a list, not a Series, so the
+            # records' own values (e.g. ints) come back rather than float64
+            total_ms_values = [
+                timings["total_ms"]
+                for timings in column("timings_ms")[filtered.index]
+                if isinstance(timings, dict) and "total_ms" in timings
+            ]
             p50_ms = 0
             p95_ms = 0
             if total_ms_values:
                 sorted_ms = sorted(total_ms_values)
-                p50_idx = len(sorted_ms) // 2
-                p95_idx = int(len(sorted_ms) * 0.95)
-                p50_ms = sorted_ms[p50_idx] if p50_idx < len(sorted_ms) else 0
-                p95_ms = sorted_ms[p95_idx] if p95_idx < len(sorted_ms) else 0
-
-            # Top regulations
-            top_regulations = sorted(
-                count_by_regulation.items(), key=lambda x: x[1], reverse=True
-            )[:10]
+                p50_ms = sorted_ms[len(sorted_ms) // 2]
+                p95_ms = sorted_ms[int(len(sorted_ms) * 0.95)]
 
             return {
                 "items": paginated_records,
@@ -564,7 +765,7 @@ if FastAPI is not None:
                 "aggregates": {
                     "count_by_decision_flag": count_by_decision_flag,
                     "count_by_agent": count_by_agent,
-                    "count_by_regulation": dict(top_regulations),
+                    "count_by_regulation": top_regulations.to_dict(),
                     "p50_ms": p50_ms,
                     "p95_ms": p95_ms,
                 },
@@ -927,3 +1128,36 @@ else:
     # Fallback for missing FastAPI
     logger.warning("FastAPI not available. Install with: pip install fastapi uvicorn")
     app = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the regulation retriever API")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    # One process by default: it already runs FAISS, torch and the endpoint
+    # threadpool across all cores, and concurrent requests only share
+    # embedding batches within a process. Each extra worker loads its own
+    # model, index and BM25 and sizes those thread pools to the whole machine.
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (default: 1)",
+    )
+    args = parser.parse_args()
+
+    # uvloop and httptools (uvicorn[standard]) replace the pure-Python event
+    # loop and HTTP parser
+    uvicorn.run(
+        "retriever.service:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
@@ -8,8 +8,10 @@ from typing import Any, Dict, List, Optional
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     requests = None
+    HTTPAdapter = None
 
 from retriever.models import RetrievalRequest, RetrievalResponse, SearchResult
 
@@ -19,13 +21,21 @@ logger = logging.getLogger(__name__)
 class RegulationClient:
     """Python client for the Regulation Retriever API."""
 
-    def __init__(self, base_url: str = "http://localhost:8000", timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: int = 30,
+        keepalive: bool = True,
+        pool_maxsize: int = 8,
+    ):
         """
         Initialize client.
 
         Args:
             base_url: API base URL
             timeout: Request timeout in seconds
+            keepalive: Reuse pooled connections across requests
+            pool_maxsize: Maximum pooled connections per host
         """
         if requests is None:
             raise ImportError(
@@ -36,10 +46,19 @@ class RegulationClient:
         self.timeout = timeout
         self.session = requests.Session()
 
+        # Pool connections so repeated calls skip DNS/TCP/TLS setup
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=pool_maxsize, max_retries=1
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # Set default headers
         self.session.headers.update(
             {"Content-Type": "application/json", "User-Agent": "RegulationClient/1.0.0"}
         )
+        if not keepalive:
+            self.session.headers["Connection"] = "close"
 
     def retrieve(
         self,
@@ -7,17 +7,30 @@ transformation, and export capabilities.
 
 import argparse
 import csv
-import json
+import io
 import logging
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, List, Optional, TextIO, Tuple
 
 import pandas as pd
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+# Buffered CSV text per chunk when streaming an export
+_STREAM_CHUNK_CHARS = 64 * 1024
+
+# Filter sets whose records load_evidence_records keeps in memory
+_RECORD_CACHE_SIZE = 16
+
 
 class EvidenceExporter:
     """
@@ -50,6 +63,11 @@ class EvidenceExporter:
             "environment",
         ]
 
+        # Loaded records per filter set, valid for one state of the log files
+        self._record_cache: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self._record_cache_signature: Optional[Tuple] = None
+        self._record_cache_lock = threading.Lock()
+
     def list_evidence_files(self) -> List[Path]:
         """List all available evidence files."""
         if not self.evidence_dir.exists():
@@ -85,13 +103,14 @@ class EvidenceExporter:
                 break
 
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
+                # Bytes go straight to the JSON parser without decoding to str
+                with open(file_path, "rb") as f:
                     for line_num, line in enumerate(f, 1):
                         if limit and record_count >= limit:
                             break
 
                         try:
-                            record = json.loads(line.strip())
+                            record = _json.loads(line.strip())
 
                             # Apply filters
                             if not self._passes_filters(
@@ -102,7 +121,7 @@ class EvidenceExporter:
                             yield record
                             record_count += 1
 
-                        except json.JSONDecodeError as e:
+                        except _json.JSONDecodeError as e:
                             logger.warning(
                                 f"Invalid JSON in {file_path}:{line_num}: {e}"
                             )
@@ -112,6 +131,53 @@ class EvidenceExporter:
                 logger.error(f"Error reading {file_path}: {e}")
                 continue
 
+    def load_evidence_records(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        agent_filter: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read evidence records with filtering, reusing earlier reads.
+
+        Results are cached per filter set until an evidence file is added,
+        removed or modified, so repeated polls of an unchanged log skip the
+        JSON parsing. The returned list is shared and must not be modified.
+
+        Args:
+            start_date: Filter records from this date
+            end_date: Filter records until this date
+            agent_filter: List of agent names to include
+
+        Returns:
+            Evidence records as dictionaries
+        """
+        signature = []
+        for path in self.list_evidence_files():
+            stat = path.stat()
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        signature = tuple(signature)
+        key = (start_date, end_date, tuple(agent_filter) if agent_filter else None)
+
+        with self._record_cache_lock:
+            if signature != self._record_cache_signature:
+                self._record_cache.clear()
+                self._record_cache_signature = signature
+            records = self._record_cache.get(key)
+            if records is not None:
+                self._record_cache.move_to_end(key)
+                return records
+
+        records = list(self.read_evidence_records(start_date, end_date, agent_filter))
+
+        with self._record_cache_lock:
+            if signature == self._record_cache_signature:
+                self._record_cache[key] = records
+                if len(self._record_cache) > _RECORD_CACHE_SIZE:
+                    self._record_cache.popitem(last=False)
+
+        return records
+
     def _passes_filters(
         self,
         record: Dict[str, Any],
@@ -333,22 +399,84 @@ class EvidenceExporter:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        exported_count = 0
-
         with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=self.csv_schema)
-            writer.writeheader()
-
-            for record in self.read_evidence_records(
-                start_date, end_date, agent_filter, limit
-            ):
-                transformed_record = self.transform_to_challenge_schema(record)
-                writer.writerow(transformed_record)
-                exported_count += 1
+            exported_count = self.write_csv(
+                csvfile, start_date, end_date, agent_filter, limit
+            )
 
         logger.info(f"Exported {exported_count} records to {output_path}")
         return exported_count
 
+    def write_csv(
+        self,
+        stream: TextIO,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        agent_filter: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """
+        Write evidence records as challenge CSV to a text stream.
+
+        Args:
+            stream: Writable text stream, e.g. an open file or io.StringIO
+            start_date: Filter records from this date
+            end_date: Filter records until this date
+            agent_filter: List of agent names to include
+            limit: Maximum number of records to export
+
+        Returns:
+            Number of records written
+        """
+        writer = csv.DictWriter(stream, fieldnames=self.csv_schema)
+        writer.writeheader()
+
+        exported_count = 0
+        for record in self.read_evidence_records(
+            start_date, end_date, agent_filter, limit
+        ):
+            writer.writerow(self.transform_to_challenge_schema(record))
+            exported_count += 1
+
+        return exported_count
+
+    def iter_csv(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        agent_filter: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Generator[str, None, None]:
+        """
+        Yield the challenge CSV in chunks of roughly 64K characters.
+
+        Meant for streaming responses: the first chunk is sent while later
+        records are still being read, and the export never touches disk.
+
+        Args:
+            start_date: Filter records from this date
+            end_date: Filter records until this date
+            agent_filter: List of agent names to include
+            limit: Maximum number of records to export
+
+        Yields:
+            CSV text, header first
+        """
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.csv_schema)
+        writer.writeheader()
+
+        for record in self.read_evidence_records(
+            start_date, end_date, agent_filter, limit
+        ):
+            writer.writerow(self.transform_to_challenge_schema(record))
+            if buffer.tell() >= _STREAM_CHUNK_CHARS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
     def export_test_dataset_csv(
         self,
         output_path: str,
@@ -477,7 +605,7 @@ class EvidenceExporter:
         decision_counts = {"true": 0, "false": 0}
         date_range = {"earliest": None, "latest": None}
 
-        for record in self.read_evidence_records(start_date, end_date, agent_filter):
+        for record in self.load_evidence_records(start_date, end_date, agent_filter):
             total_records += 1
 
             # Agent counts
@@ -179,6 +179,31 @@ def test_bm25_scorer():
     assert max_score_idx == 0
 
 
+def test_bm25_numba_scorer():
+    """Test the Numba BM25 kernel scores like the NumPy path."""
+    pytest.importorskip("numba")
+
+    documents = [
+        "age verification requirements for social media platforms",
+        "parental consent for minors under 16 years old",
+        "systemic risk assessment for very large platforms",
+        "content moderation and illegal content removal",
+        "age assurance for minors on social media",
+    ]
+
+    bm25 = BM25Scorer()
+    bm25.fit(documents)
+    numba_bm25 = BM25Scorer(use_numba=True)
+    numba_bm25.fit(documents)
+    assert numba_bm25.use_numba
+
+    for query in ["age verification minors", "social media platforms", "unknown"]:
+        assert numba_bm25.score(query) == pytest.approx(bm25.score(query))
+        assert numba_bm25.score(query, [4, 0]) == pytest.approx(
+            bm25.score(query, [4, 0])
+        )
+
+
 def test_search_models():
     """Test search result models."""
     from retriever.models import (RetrievalRequest, RetrievalResponse,
@@ -276,6 +301,105 @@ def test_hybrid_retriever():
         assert results[0].score >= results[1].score
 
 
+def test_hybrid_retriever_rrf():
+    """Test Reciprocal Rank Fusion ranks by summed reciprocal ranks."""
+    chunks = [
+        TextChunk(
+            chunk_id=f"test_{i}",
+            law_id="EUDSA",
+            law_name="EU DSA",
+            jurisdiction="EU",
+            section_label=f"Article {i}",
+            section_path=f"Article {i}",
+            content=content,
+            start_line=i,
+            end_line=i + 1,
+            source_path="test.txt",
+            char_start=0,
+            char_end=len(content),
+        )
+        for i, content in enumerate(
+            [
+                "systemic risk assessment platforms",
+                "risk mitigation measures",
+                "parental consent verification",
+                "advertising transparency repository",
+                "minor account termination",
+            ]
+        )
+    ]
+
+    retriever = HybridRetriever(fusion="rrf", rrf_k=60)
+    retriever.fit(chunks)
+
+    # Chunk 0 ranks first in both lists, chunk 1 second in both
+    results = retriever.retrieve(
+        query="systemic risk", dense_scores=[(0.9, 0), (0.5, 1)], top_k=3
+    )
+
+    assert [r.section_label for r in results[:2]] == ["Article 0", "Article 1"]
+    assert results[0].score == pytest.approx(2 / 61)
+    assert results[1].score == pytest.approx(2 / 62)
+    assert results[2].score == 0
+
+    with pytest.raises(ValueError):
+        HybridRetriever(fusion="max")
+
+
+def test_hybrid_retriever_law_indices():
+    """Test law filters resolve to ascending chunk indices."""
+    chunks = [
+        TextChunk(
+            chunk_id=f"test_{i}",
+            law_id=law_id,
+            law_name=law_id,
+            jurisdiction="US",
+            section_label=f"Section {i}",
+            section_path=f"Section {i}",
+            content=f"section {i} content",
+            start_line=i,
+            end_line=i + 1,
+            source_path="test.txt",
+            char_start=0,
+            char_end=20,
+        )
+        for i, law_id in enumerate(["CA_SB976", "FL_HB3", "CA_SB976", "UT_SMRA"])
+    ]
+
+    retriever = HybridRetriever()
+    retriever.fit(chunks)
+
+    assert retriever.law_indices({"UT_SMRA", "CA_SB976"}).tolist() == [0, 2, 3]
+    assert retriever.law_indices({"FL_HB3", "UNKNOWN"}).tolist() == [1]
+    assert len(retriever.law_indices({"UNKNOWN"})) == 0
+
+
+def test_p2_quantile():
+    """Test streaming quantile estimates track exact percentiles."""
+    import random
+
+    from retriever.quantile import P2Quantile
+
+    rng = random.Random(0)
+    values = [rng.expovariate(1 / 100) for _ in range(10000)]
+    exact = sorted(values)
+
+    for p in (0.5, 0.95):
+        estimator = P2Quantile(p)
+        for value in values:
+            estimator.update(value)
+        assert estimator.value() == pytest.approx(exact[int(p * len(exact))], rel=0.05)
+
+    # Few observations fall back to the sorted values
+    estimator = P2Quantile(0.5)
+    for value in (5, 1, 3):
+        estimator.update(value)
+    assert estimator.value() == 3
+
+    with pytest.raises(ValueError):
+        P2Quantile(1.5)
+
+
 @pytest.mark.asyncio
 async def test_api_models():
     """Test API request/response models."""
@@ -303,6 +427,43 @@ async def test_api_models():
         pytest.skip("FastAPI not available for testing")
 
 
+def test_evidence_latency_percentiles(tmp_path, monkeypatch):
+    """Test /evidence percentiles return the records' own total_ms values."""
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    import retriever.service as service_module
+    from src.evidence import EvidenceExporter
+
+    records = [
+        {"agent_name": "a", "timestamp_iso": "2024-01-01T00:00:00"},
+        {
+            "agent_name": "a",
+            "timestamp_iso": "2024-01-02T00:00:00",
+            "timings_ms": {"total_ms": 390},
+        },
+        {"agent_name": "b", "timestamp_iso": "2024-01-03T00:00:00", "timings_ms": {}},
+        {
+            "agent_name": "b",
+            "timestamp_iso": "2024-01-04T00:00:00",
+            "timings_ms": {"total_ms": 120},
+        },
+    ]
+    (tmp_path / "evidence.jsonl").write_text(
+        "".join(json.dumps(record) + "\n" for record in records)
+    )
+    monkeypatch.setattr(
+        service_module, "evidence_exporter", EvidenceExporter(str(tmp_path))
+    )
+
+    response = TestClient(service_module.app).get("/evidence")
+    assert response.status_code == 200
+
+    aggregates = response.json()["aggregates"]
+    assert aggregates["p50_ms"] == 390 and isinstance(aggregates["p50_ms"], int)
+    assert aggregates["p95_ms"] == 390 and isinstance(aggregates["p95_ms"], int)
+
+
 def test_query_tokenization():
     """Test BM25 tokenization for legal text."""
     bm25 = BM25Scorer()